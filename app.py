@@ -808,76 +808,80 @@
 #         """, unsafe_allow_html=True)
 
 
+import html
+import os
+import time
+import uuid
 import streamlit as st
-import re
-import random
-import string
+from collections import deque
 from datetime import datetime
 
+import metrics
+from breach_range import open_range_source
+from cache import cached_check_password_strength
+from entropy import estimate_guesses
+from generator import generate_password
+from history import HistoryEntry, HistoryStore
+from incremental import IncrementalEvaluator
+from passphrase import generate_passphrase
+from policy import EMBEDDED_COMMON, EXACT_COMMON, PolicyFile
+from strength import load_common_passwords, load_common_words, scoring_policy, set_scoring_policy
+
 # Set page configuration
 st.set_page_config(page_title='Giaic Password Guardian', page_icon='🔐', layout='centered')
 
-# Common password list
-COMMON_PASSWORDS = [
-    'password', '12345678', 'qwerty123', 'letmein', 'admin123',
-    'welcome1', 'monkey', 'sunshine', 'password1', '123456789'
-]
-
-def check_password_strength(password: str) -> tuple:
-    score = 0
-    feedback = []
-
-    # Length Check
-    if len(password) >= 12:
-        score += 2
-        feedback.append("✅ Password length is excellent (12+ characters)")
-    elif len(password) >= 8:
-        score += 1
-        feedback.append("⚠️ Password length is good but could be longer (8+ recommended)")
-    else:
-        feedback.append("❌ Password should be at least 8 characters long")
-
-    # Character Diversity Check
-    checks = {
-        'uppercase': re.search(r"[A-Z]", password),
-        'lowercase': re.search(r"[a-z]", password),
-        'digit': re.search(r"\d", password),
-        'special': re.search(r"[!@#$%^&*]", password)
-    }
-    
-    diversity_score = sum(1 for check in checks.values() if check)
-    score += diversity_score
-    if diversity_score == 4:
-        feedback.append("✅ Excellent character diversity (uppercase, lowercase, number, special)")
-    else:
-        missing = [k for k, v in checks.items() if not v]
-        feedback.append(f"❌ Missing character types: {', '.join(missing)}")
+# Optional large breached-password list, loaded once per worker process
+@st.cache_resource
+def load_breach_index(path, error_rate):
+    return load_common_passwords(path, error_rate=error_rate)
 
-    # Common Password Check
-    if password.lower() in COMMON_PASSWORDS:
-        score = max(0, score - 2)
-        feedback.append("❌ Password is in common passwords list - very insecure!")
-    else:
-        score += 1
-
-    # Final Evaluation
-    strength = "💪 Extremely Strong" if score >= 8 else \
-               "🔒 Strong" if score >= 6 else \
-               "🛡 Moderate" if score >= 4 else \
-               "⚠️ Weak"
-
-    return strength, score, feedback
-
-def generate_password(length=12):
-    """Generate a secure password with required character types"""
-    characters = string.ascii_letters + string.digits + "!@#$%^&*"
-    while True:
-        password = ''.join(random.choice(characters) for _ in range(length))
-        if (re.search(r"[A-Z]", password) and
-            re.search(r"[a-z]", password) and
-            re.search(r"\d", password) and
-            re.search(r"[!@#$%^&*]", password)):
-            return password
+if os.environ.get('PASSWORD_GUARDIAN_WORDLIST'):
+    error_rate = os.environ.get('PASSWORD_GUARDIAN_WORDLIST_ERROR_RATE')
+    load_breach_index(os.environ['PASSWORD_GUARDIAN_WORDLIST'],
+                      float(error_rate) if error_rate else None)
+
+# Optional list of words detected when embedded in a password
+@st.cache_resource
+def load_embedded_words(path):
+    return load_common_words(path)
+
+if os.environ.get('PASSWORD_GUARDIAN_WORDS'):
+    load_embedded_words(os.environ['PASSWORD_GUARDIAN_WORDS'])
+
+# Optional k-anonymity breach store (directory or local range server URL)
+@st.cache_resource
+def load_breach_ranges(location):
+    return open_range_source(location)
+
+breach_ranges = None
+if os.environ.get('PASSWORD_GUARDIAN_RANGE_STORE'):
+    breach_ranges = load_breach_ranges(os.environ['PASSWORD_GUARDIAN_RANGE_STORE'])
+
+# Optional metrics file, rewritten periodically in Prometheus text format
+@st.cache_resource
+def start_metrics_file(path):
+    metrics.enable()
+    return metrics.start_file_writer(path)
+
+if os.environ.get('PASSWORD_GUARDIAN_METRICS_FILE'):
+    start_metrics_file(os.environ['PASSWORD_GUARDIAN_METRICS_FILE'])
+
+# Optional scoring policy file (TOML or JSON), reloaded when it changes
+@st.cache_resource
+def load_scoring_policy(path):
+    return PolicyFile(path)
+
+if os.environ.get('PASSWORD_GUARDIAN_POLICY'):
+    set_scoring_policy(load_scoring_policy(os.environ['PASSWORD_GUARDIAN_POLICY']).current())
+
+# Optional persistent check history (SQLite); otherwise it lives in the session
+@st.cache_resource
+def open_history_store(path):
+    return HistoryStore(path)
+
+history_store = None
+if os.environ.get('PASSWORD_GUARDIAN_HISTORY_DB'):
+    history_store = open_history_store(os.environ['PASSWORD_GUARDIAN_HISTORY_DB'])
 
 # Custom CSS for animations and styling
 st.markdown("""
@@ -958,16 +962,32 @@ st.markdown("""
 
 # Initialize session state for history
 if 'history' not in st.session_state:
-    st.session_state.history = []
-
-def check_minimum_standards(password):
-    return {
-        'length': len(password) >= 8,
-        'uppercase': bool(re.search(r'[A-Z]', password)),
-        'lowercase': bool(re.search(r'[a-z]', password)),
-        'digit': bool(re.search(r'\d', password)),
-        'special': bool(re.search(r'[!@#$%^&*]', password))
-    }
+    st.session_state.history = deque(maxlen=5)
+
+
+def stable_user_id():
+    """Key of the persistent history for this visitor.
+
+    Browsers have no stable identity of their own: without Streamlit login
+    the id lives in the page URL (``?uid=``), so it survives reloads and
+    server restarts as long as the same link is used, but a fresh link
+    starts a new history.
+    """
+    user = getattr(st, 'user', None)
+    if user is not None and user.get('is_logged_in') and user.get('email'):
+        return user['email']
+    query_params = getattr(st, 'query_params', None)
+    if query_params is None:
+        return uuid.uuid4().hex
+    uid = query_params.get('uid', '')
+    if len(uid) != 32 or not all(c in '0123456789abcdef' for c in uid):
+        uid = uuid.uuid4().hex
+        query_params['uid'] = uid
+    return uid
+
+
+if 'user_id' not in st.session_state:
+    st.session_state.user_id = stable_user_id()
 
 # Animated sidebar
 with st.sidebar:
@@ -976,16 +996,31 @@ with st.sidebar:
     # Password Generator Section
     st.markdown("---")
     st.subheader("🔧 Password Generator")
-    pwd_length = st.number_input("Password Length", min_value=8, max_value=20, value=12, step=1)
+    generator_mode = st.radio("Generator Mode", ["Random Characters", "Passphrase"], horizontal=True)
+    if generator_mode == "Passphrase":
+        word_count = st.number_input("Number of Words", min_value=4, max_value=10, value=6, step=1)
+        separator = st.selectbox("Word Separator", ["-", ".", "_", " "])
+        capitalize = st.checkbox("Capitalize Words")
+        add_digit = st.checkbox("Add a Number")
+    else:
+        pwd_length = st.number_input("Password Length", min_value=8, max_value=20, value=12, step=1)
     
     if st.button("✨ Generate Secure Password", key="generate_btn"):
-        generated_pwd = generate_password(pwd_length)
+        if generator_mode == "Passphrase":
+            generated = generate_passphrase(word_count, separator, capitalize, add_digit)
+            generated_pwd = generated.phrase
+            st.session_state.generated_entropy = generated.entropy_bits
+        else:
+            generated_pwd = generate_password(pwd_length)
+            st.session_state.pop('generated_entropy', None)
         st.session_state.pwd_input = generated_pwd
         st.session_state.generated_password = generated_pwd
     
     if 'generated_password' in st.session_state:
         st.markdown("### Generated Password")
         st.code(st.session_state.generated_password, language="text")
+        if 'generated_entropy' in st.session_state:
+            st.caption(f"🔑 Entropy: {st.session_state.generated_entropy:.1f} bits")
         
         # Copy button with feedback
         col1, col2 = st.columns([1, 3])
@@ -1017,102 +1052,168 @@ with st.sidebar:
 
 # Main content
 st.markdown("<h1>🔒 Giaic Password Strength Meter</h1>", unsafe_allow_html=True)
-password = st.text_input("Enter your password:", type="password", key="pwd_input")
-
-# Real-time security standards checklist
-if password:
-    standards = check_minimum_standards(password)
-    common_password = password.lower() in COMMON_PASSWORDS
-else:
-    standards = {key: False for key in ['length', 'uppercase', 'lowercase', 'digit', 'special']}
-    common_password = False
 
-with st.container():
-    st.markdown("""
-    <div class="security-checklist">
-        <h4>🔍 Minimum Security Standards</h4>
-    """, unsafe_allow_html=True)
-    
-    checklist_items = [
-        ("At least 8 characters", 'length'),
-        ("Contains uppercase letter (A-Z)", 'uppercase'),
-        ("Contains lowercase letter (a-z)", 'lowercase'),
-        ("Contains digit (0-9)", 'digit'),
-        ("Contains special character (!@#$%^&*)", 'special'),
-        ("Not a common password", 'common')
-    ]
-    
-    for text, key in checklist_items:
-        if key == 'common':
-            met = not common_password
-            icon = "✅" if met else "❌"
-            color_class = "requirement-met" if met else "requirement-unmet"
-            st.markdown(f"""
-            <div style="margin: 8px 0; padding: 5px;">
-                <span style="font-size: 1.2em;">{icon}</span>
-                <span class="{color_class}">{text}</span>
-            </div>
-            """, unsafe_allow_html=True)
+# Interactions inside a fragment rerun only that function, not the whole
+# script (CSS, sidebar); older Streamlit releases only have the experimental name
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+CHECKLIST_TEXT = {
+    'uppercase': "Contains uppercase letter (A-Z)",
+    'lowercase': "Contains lowercase letter (a-z)",
+    'digit': "Contains digit (0-9)",
+}
+
+
+def checklist_items(policy):
+    """``(text, key)`` rows for the policy's minimum standards and the common check."""
+    items = []
+    for key, _ in policy.minimum_rules:
+        if key == 'length':
+            text = f"At least {policy.minimum_length} characters"
+        elif key == 'special':
+            text = f"Contains special character ({html.escape(policy.special_characters)})"
         else:
-            met = standards.get(key, False)
-            icon = "✅" if met else "❌"
-            color_class = "requirement-met" if met else "requirement-unmet"
-            st.markdown(f"""
-            <div style="margin: 8px 0; padding: 5px;">
-                <span style="font-size: 1.2em;">{icon}</span>
-                <span class="{color_class}">{text}</span>
+            text = CHECKLIST_TEXT[key]
+        items.append((text, key))
+    items.append(("Not a common password", 'common'))
+    return items
+
+
+def render_checklist(standards, common_met):
+    """Render the whole checklist as a single HTML element."""
+    rows = []
+    for text, key in checklist_items(scoring_policy()):
+        met = common_met if key == 'common' else standards.get(key, False)
+        icon = "✅" if met else "❌"
+        color_class = "requirement-met" if met else "requirement-unmet"
+        rows.append(f'<div style="margin: 8px 0; padding: 5px;">'
+                    f'<span style="font-size: 1.2em;">{icon}</span> '
+                    f'<span class="{color_class}">{text}</span></div>')
+    st.markdown('<div class="security-checklist"><h4>🔍 Minimum Security Standards</h4>'
+                + ''.join(rows) + '</div>', unsafe_allow_html=True)
+
+
+def render_history(history):
+    items = ''.join(f"""
+        <div class="history-item">
+            <div style="display: flex; justify-content: space-between;">
+                <div>{datetime.fromtimestamp(entry.timestamp).strftime("%Y-%m-%d %H:%M")}</div>
+                <div>{entry.strength}</div>
             </div>
-            """, unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
+            <div style="color: #666; margin-top: 5px;">
+                {'*' * entry.length} • Score: {entry.score}/10
+            </div>
+        </div>""" for entry in history)
+    st.markdown(items, unsafe_allow_html=True)
+
+
+def render_trend(user):
+    """Charts read from the store's precomputed aggregates, not the raw rows."""
+    checks, mean_score, weak_rate = history_store.summary(user)
+    if not checks:
+        return
+    with st.expander("📈 Your Security Trend"):
+        st.markdown(f"**{checks:,}** checks • average score **{mean_score:.1f}**/10 • "
+                    f"**{weak_rate:.0%}** weak")
+        trend = history_store.daily_trend(user)
+        if trend:
+            st.line_chart({'Average score': {day.day: day.mean_score for day in trend},
+                           'Weak %': {day.day: day.weak_rate * 100 for day in trend}})
+        st.bar_chart({'Checks': {str(score): count for score, count
+                                 in history_store.score_distribution(user).items()}})
+
+
+def render_assessment(password):
+    strength, score, feedback = cached_check_password_strength(password)
+
+    # Update history; only the length of the password is kept
+    if history_store is not None:
+        history_store.record(st.session_state.user_id, strength, score, len(password))
+    else:
+        st.session_state.history.appendleft(
+            HistoryEntry(st.session_state.user_id, time.time(), strength, score, len(password)))
+
+    # Display results
+    st.subheader(f"Security Assessment: {strength}")
+    st.progress(min(score/10, 1.0))
+
+    estimate = estimate_guesses(password)
+    st.markdown(f"🔑 **Entropy Level:** {estimate.entropy_bits:.1f} bits "
+                f"(about 10^{estimate.guesses_log10:.0f} guesses to crack)")
+
+    with st.expander("🔍 Detailed Security Analysis", expanded=True):
+        lines = [f"- {item}" for item in feedback]
+        lines.extend(f"- 🔎 Guessable {match.pattern.replace('_', ' ')} pattern "
+                     f"({len(match.token)} characters)"
+                     for match in estimate.sequence if match.pattern != 'bruteforce')
+        st.markdown('\n'.join(lines))
+
+    # Threat detection against the breach store
+    if breach_ranges is not None:
+        try:
+            breaches = breach_ranges.breach_count(password)
+        except OSError:
+            # Range server down or answering with an error (URLError, HTTPError)
+            st.warning("🛡 The breach store could not be reached; breach check skipped")
+        else:
+            if breaches:
+                st.error(f"🛡 **Breach Alert:** This password appears {breaches:,} times in known breaches!")
+            else:
+                st.success("🛡 Not found in known breaches")
+
+    # Security recommendations
+    if score < 6:
+        st.error("**Security Alert:** This password doesn't meet minimum security standards!")
+    else:
+        st.success("**Verified Secure:** This password meets recommended security standards!")
+
+
+@fragment
+def password_panel():
+    password = st.text_input("Enter your password:", type="password", key="pwd_input")
 
-if common_password:
-    st.error("⚠️ Warning: This password is in a list of commonly used passwords!")
+    # Real-time security standards checklist, updated incrementally: each
+    # rerun only processes the characters that changed since the last one
+    if 'live_evaluator' not in st.session_state:
+        st.session_state.live_evaluator = IncrementalEvaluator()
+    live_evaluator = st.session_state.live_evaluator
+    live_evaluator.set(password)
 
-if st.button("🚀 Check Password Strength", use_container_width=True):
     if password:
-        strength, score, feedback = check_password_strength(password)
-        
-        # Update history
-        st.session_state.history.insert(0, {
-            'time': datetime.now().strftime("%Y-%m-%d %H:%M"),
-            'strength': strength,
-            'score': score,
-            'password': '*' * len(password)
-        })
-        
-        # Keep only last 5 entries
-        if len(st.session_state.history) > 5:
-            st.session_state.history.pop()
-        
-        # Display results
-        st.subheader(f"Security Assessment: {strength}")
-        st.progress(min(score/10, 1.0))
-        
-        with st.expander("🔍 Detailed Security Analysis", expanded=True):
-            for item in feedback:
-                st.markdown(f"- {item}")
-        
-        # Security recommendations
-        if score < 6:
-            st.error("**Security Alert:** This password doesn't meet minimum security standards!")
+        standards = live_evaluator.minimum_standards()
+        common_level = live_evaluator.common_level()
+        common_password = common_level == EXACT_COMMON
+        embedded_common_word = common_level == EMBEDDED_COMMON
+        live_strength, live_score, _ = live_evaluator.result()
+        st.progress(min(live_score / 10, 1.0), text=f"Live strength: {live_strength}")
+    else:
+        standards = {}
+        common_password = False
+        embedded_common_word = False
+
+    render_checklist(standards, not (common_password or embedded_common_word))
+
+    if common_password:
+        st.error("⚠️ Warning: This password is in a list of commonly used passwords!")
+    elif embedded_common_word:
+        st.warning("⚠️ Warning: This password contains a commonly used password or word!")
+
+    if st.button("🚀 Check Password Strength", use_container_width=True):
+        if password:
+            render_assessment(password)
         else:
-            st.success("**Verified Secure:** This password meets recommended security standards!")
+            st.warning("Please enter a password to analyze")
+
+    # Display history
+    if history_store is not None:
+        history = history_store.recent(st.session_state.user_id)
     else:
-        st.warning("Please enter a password to analyze")
+        history = st.session_state.history
+    if history:
+        st.subheader("📜 Security Check History")
+        render_history(history)
+        if history_store is not None:
+            render_trend(st.session_state.user_id)
 
-# Display history
-if st.session_state.history:
-    st.subheader("📜 Security Check History")
-    for entry in st.session_state.history:
-        st.markdown(f"""
-        <div class="history-item">
-            <div style="display: flex; justify-content: space-between;">
-                <div>{entry['time']}</div>
-                <div>{entry['strength']}</div>
-            </div>
-            <div style="color: #666; margin-top: 5px;">
-                {entry['password']} • Score: {entry['score']}/10
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+
+password_panel()
@@ -0,0 +1,204 @@
+"""Command-line strength audit for newline-delimited password files.
+
+    python audit.py passwords.txt --format jsonl --output results.jsonl
+    zcat dump.gz | python audit.py - --workers 8 > results.csv
+
+The input is read in newline-aligned blocks of ``--chunk-size`` bytes and
+scored by a pool of worker processes. Only a bounded number of blocks is in
+flight at any time and results are written in input order, so memory use
+stays constant however large the file is. Every record carries the byte
+offset of its line instead of the password itself.
+
+After each block the offset of the next unread byte is written to
+``--checkpoint`` (if given); pass it back with ``--offset`` to resume an
+interrupted run. Empty lines are skipped.
+
+With ``--wordlist`` the common-password check also consults a breach
+wordlist, SHA-1 dump or prebuilt index (see breach.py), and ``--words``
+replaces the words detected inside passwords; every worker loads them once
+when it starts.
+"""
+import argparse
+import collections
+import concurrent.futures
+import csv
+import io
+import json
+import os
+import sys
+
+import strength
+from policy import load_policy
+
+STRENGTH_ORDER = ("⚠️ Weak", "🛡 Moderate", "🔒 Strong", "💪 Extremely Strong")
+CSV_FIELDS = ('offset', 'length', 'score', 'strength', 'feedback')
+
+
+def read_chunks(stream, chunk_size, offset=0):
+    """Yield ``(offset, data)`` blocks that end on a line boundary."""
+    pending = b''
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        block = pending + block
+        cut = block.rfind(b'\n') + 1
+        if cut == 0:
+            pending = block
+            continue
+        yield offset, block[:cut]
+        offset += cut
+        pending = block[cut:]
+    if pending:
+        yield offset, pending
+
+
+def _init_worker(wordlist=None, error_rate=None, policy_path=None, words=None):
+    # Loaded once per worker process, not once per block
+    if wordlist:
+        strength.load_common_passwords(wordlist, error_rate=error_rate)
+    if words:
+        strength.load_common_words(words)
+    if policy_path:
+        strength.set_scoring_policy(load_policy(policy_path))
+
+
+def score_chunk(offset, data, output_format):
+    """Score one block; returns ``(end_offset, formatted_records, histogram)``."""
+    lines = data.split(b'\n')
+    if lines and not lines[-1]:
+        lines.pop()
+    positions = []
+    passwords = []
+    position = offset
+    for line in lines:
+        line_end = position + len(line) + 1
+        line = line.rstrip(b'\r')
+        if line:
+            positions.append(position)
+            passwords.append(line.decode('utf-8', 'surrogateescape'))
+        position = line_end
+    results = strength.check_password_strength_many(passwords)
+
+    out = io.StringIO()
+    writer = csv.writer(out) if output_format == 'csv' else None
+    histogram = collections.Counter()
+    for position, password, (label, score, codes) in zip(positions, passwords, results):
+        histogram[label] += 1
+        if writer is not None:
+            writer.writerow((position, len(password), score, label, ' '.join(codes)))
+        else:
+            out.write(json.dumps({'offset': position, 'length': len(password), 'score': score,
+                                  'strength': label, 'feedback': codes},
+                                 ensure_ascii=False))
+            out.write('\n')
+    return offset + len(data), out.getvalue(), histogram
+
+
+def _skip_to(stream, offset):
+    if offset and stream.seekable():
+        stream.seek(offset)
+        return
+    remaining = offset
+    while remaining:
+        skipped = len(stream.read(min(remaining, 1 << 20)))
+        if not skipped:
+            break
+        remaining -= skipped
+
+
+def _write_checkpoint(path, offset):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as fh:
+        fh.write(f"{offset}\n")
+    os.replace(tmp, path)
+
+
+def run_audit(stream, out, output_format='csv', workers=None, chunk_size=1 << 20,
+              offset=0, checkpoint=None, policy_path=None, wordlist=None, error_rate=None,
+              words=None):
+    """Audit ``stream`` (binary) into ``out`` (text); returns the strength histogram."""
+    if policy_path:
+        # Fail fast on a broken policy instead of in every worker
+        load_policy(policy_path)
+    for path in (wordlist, words):
+        if path and not os.path.isfile(path):
+            raise FileNotFoundError(path)
+    _skip_to(stream, offset)
+    workers = workers or os.cpu_count() or 1
+    histogram = collections.Counter()
+    if output_format == 'csv' and offset == 0:
+        csv.writer(out).writerow(CSV_FIELDS)
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(wordlist, error_rate, policy_path, words)) as pool:
+        in_flight = collections.deque()
+        chunks = read_chunks(stream, chunk_size, offset)
+
+        def drain_one():
+            end_offset, text, counts = in_flight.popleft().result()
+            out.write(text)
+            histogram.update(counts)
+            if checkpoint:
+                out.flush()
+                _write_checkpoint(checkpoint, end_offset)
+
+        for start, data in chunks:
+            # Two blocks per worker keep every process busy without
+            # reading ahead of what the pool can absorb
+            if len(in_flight) >= workers * 2:
+                drain_one()
+            in_flight.append(pool.submit(score_chunk, start, data, output_format))
+        while in_flight:
+            drain_one()
+    return histogram
+
+
+def format_histogram(histogram):
+    total = sum(histogram.values()) or 1
+    width = max(len(label) for label in STRENGTH_ORDER)
+    lines = []
+    for label in STRENGTH_ORDER:
+        count = histogram.get(label, 0)
+        bar = '#' * round(40 * count / total)
+        lines.append(f"{label:<{width}} {count:>12,} {100 * count / total:6.2f}% {bar}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit the strength of a newline-delimited password file.")
+    parser.add_argument('input', help="password file, or - for stdin")
+    parser.add_argument('--output', '-o', help="results file (default: stdout)")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=1 << 20, help="bytes per work unit")
+    parser.add_argument('--offset', type=int, default=0, help="byte offset to resume from")
+    parser.add_argument('--checkpoint', help="file updated with the next offset after every block")
+    parser.add_argument('--policy', help="scoring policy file (.toml or .json)")
+    parser.add_argument('--wordlist', help="breach wordlist, dump or prebuilt index")
+    parser.add_argument('--error-rate', type=float, default=None,
+                        help="load --wordlist into a Bloom filter with this false positive rate")
+    parser.add_argument('--words', help="plaintext wordlist of words to detect inside passwords")
+    args = parser.parse_args(argv)
+
+    stream = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    if args.output:
+        # Resumed runs append to the existing results
+        out = open(args.output, 'a' if args.offset else 'w', encoding='utf-8', newline='')
+    else:
+        out = sys.stdout
+    try:
+        histogram = run_audit(stream, out, args.format, args.workers, args.chunk_size,
+                              args.offset, args.checkpoint, args.policy,
+                              args.wordlist, args.error_rate, args.words)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+    print(format_histogram(histogram), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""Aho-Corasick automaton for finding embedded dictionary words.
+
+The automaton is built once from a wordlist and then finds every occurrence
+of every word in a single left-to-right scan of the input. The trie is
+stored as a double array: the child of state ``s`` on column ``c`` is
+``t = base[s] + c`` if ``check[t] == s``, so every state costs a few flat
+``array('i')`` entries however large the alphabet is. A missing transition
+follows the failure link, which keeps a scan linear in the input. Column 0
+stands for characters outside the wordlist alphabet, which always lead back
+to the root. ASCII input is mapped to columns with a single
+``bytes.translate`` instead of a dict lookup per character.
+
+The trie is laid out directly from the sorted words, breadth first, so no
+per-node objects are created; failure and output links are filled in
+during the same pass.
+"""
+from array import array
+from collections import deque
+
+ROOT = 0
+
+
+class Automaton:
+    """Multi-pattern matcher over a fixed list of words."""
+
+    def __init__(self, words):
+        self.words = words = list(dict.fromkeys(w for w in words if w))
+        # Columns follow code point order, so sorting the words sorts their
+        # column sequences; ASCII characters get the lowest columns
+        alphabet = sorted({ch for word in words for ch in word})
+        self._alphabet = columns = {ch: i + 1 for i, ch in enumerate(alphabet)}
+        width = len(alphabet) + 1
+        order = sorted(range(len(words)), key=words.__getitem__)
+
+        base = array('i', [0])
+        check = array('i', [-1])
+        fail = array('i', [0])
+        word_at = array('i', [-1])
+        # Nearest proper suffix state (via failure links) that ends a word
+        output_link = array('i', [-1])
+        used = bytearray(b'\x01')
+        first_free = 1
+        # Where searches for states with several children start; moved up
+        # past crowded regions so they are not rescanned for every state
+        wide_free = 1
+
+        queue = deque([(ROOT, 0, len(order), 0)])
+        states = 1
+        while queue:
+            state, lo, hi, depth = queue.popleft()
+            # Group the words below this state by their next character
+            children = []
+            i = lo
+            while i < hi:
+                ch = words[order[i]][depth]
+                j = i + 1
+                while j < hi and words[order[j]][depth] == ch:
+                    j += 1
+                children.append((columns[ch], i, j))
+                i = j
+            if not children:
+                continue
+
+            # Lowest base whose child slots are all free
+            first = children[0][0]
+            if len(children) == 1:
+                position = max(first_free, first)
+            else:
+                position = max(wide_free, first_free, first)
+            attempts = 0
+            while True:
+                position = used.find(0, position)
+                if position < 0:
+                    position = len(used)
+                offset = position - first
+                last = offset + children[-1][0]
+                if last >= len(used):
+                    used.extend(bytes(last - len(used) + 1 + len(used) // 2))
+                for column, _, _ in children:
+                    if used[offset + column]:
+                        break
+                else:
+                    break
+                position += 1
+                attempts += 1
+            if attempts > 16:
+                wide_free = position
+            base[state] = offset
+            needed = offset + width + 1 - len(check)
+            if needed > 0:
+                # Grow geometrically; the unused tail is trimmed at the end
+                needed = max(needed, len(check) // 2)
+                base.extend(bytes(4 * needed))
+                check.extend(array('i', [-1]) * needed)
+                fail.extend(bytes(4 * needed))
+                word_at.extend(array('i', [-1]) * needed)
+                output_link.extend(array('i', [-1]) * needed)
+
+            for column, i, j in children:
+                child = offset + column
+                used[child] = 1
+                check[child] = state
+                states += 1
+                if len(words[order[i]]) == depth + 1:
+                    # Sorted: a word ending here comes first in its group
+                    word_at[child] = order[i]
+                    i += 1
+                # Failure states are shallower, so already placed
+                target = ROOT
+                if state != ROOT:
+                    f = fail[state]
+                    while True:
+                        # base[f] + width < len(check): f was placed earlier
+                        t = base[f] + column
+                        if check[t] == f:
+                            target = t
+                            break
+                        if f == ROOT:
+                            break
+                        f = fail[f]
+                fail[child] = target
+                output_link[child] = target if word_at[target] >= 0 else output_link[target]
+                if i < j:
+                    queue.append((child, i, j, depth + 1))
+            first_free = used.find(0, first_free)
+            if first_free < 0:
+                first_free = len(used)
+
+        # Keep just enough slots that base[s] + column never runs past the end
+        size = max(len(used.rstrip(b'\x00')), max(base) + width)
+        self._base = base[:size]
+        self._check = check[:size]
+        self._fail = fail[:size]
+        self._word_at = word_at[:size]
+        self._output_link = output_link[:size]
+        # Any word ending at this state, directly or through a suffix
+        self._accepts = bytes(w >= 0 or o >= 0 for w, o in zip(self._word_at, self._output_link))
+        ascii_columns = bytearray(256)
+        for ch, column in columns.items():
+            if ch.isascii():
+                ascii_columns[ord(ch)] = column
+        self._ascii_columns = bytes(ascii_columns)
+        self.state_count = states
+
+    def __len__(self):
+        return len(self.words)
+
+    def tables(self):
+        """Return ``(base, check, fail, accepts, ascii_columns)`` for external scanners.
+
+        The child of ``state`` on ``column`` is ``t = base[state] + column``
+        when ``check[t] == state``; otherwise retry from ``fail[state]``, and
+        column 0 or a miss at the root leads to the root. ``accepts[state]``
+        is non-zero when a word ends there and ``ascii_columns`` maps a byte
+        to its column.
+        """
+        return self._base, self._check, self._fail, self._accepts, self._ascii_columns
+
+    def _columns(self, text):
+        if text.isascii():
+            return text.encode('ascii').translate(self._ascii_columns)
+        alphabet = self._alphabet
+        return [alphabet.get(ch, 0) for ch in text]
+
+    def start(self):
+        return ROOT
+
+    def _next(self, state, column):
+        if not column:
+            return ROOT
+        base = self._base
+        check = self._check
+        while True:
+            t = base[state] + column
+            if check[t] == state:
+                return t
+            if state == ROOT:
+                return ROOT
+            state = self._fail[state]
+
+    def step(self, state, ch):
+        """Advance ``state`` by one character and return the new state."""
+        return self._next(state, self._alphabet.get(ch, 0))
+
+    def matches_at(self, state):
+        """Word indexes that end at ``state``, longest first."""
+        word_at = self._word_at
+        link = self._output_link
+        if word_at[state] < 0:
+            state = link[state]
+        while state >= 0:
+            yield word_at[state]
+            state = link[state]
+
+    def _states(self, text):
+        """Yield the state after every character of ``text``."""
+        base = self._base
+        check = self._check
+        fail = self._fail
+        state = ROOT
+        for column in self._columns(text):
+            if not column:
+                state = ROOT
+            else:
+                while True:
+                    t = base[state] + column
+                    if check[t] == state:
+                        state = t
+                        break
+                    if state == ROOT:
+                        break
+                    state = fail[state]
+            yield state
+
+    def find_all(self, text):
+        """Yield ``(start, end, word_index)`` for every occurrence, end inclusive."""
+        accepts = self._accepts
+        word_at = self._word_at
+        link = self._output_link
+        words = self.words
+        for end, state in enumerate(self._states(text)):
+            if not accepts[state]:
+                continue
+            s = state if word_at[state] >= 0 else link[state]
+            while s >= 0:
+                index = word_at[s]
+                yield end - len(words[index]) + 1, end, index
+                s = link[s]
+
+    def contains(self, text):
+        """True if any word occurs in ``text``; stops at the first one."""
+        accepts = self._accepts
+        for state in self._states(text):
+            if accepts[state]:
+                return True
+        return False
+
+    def search(self, text):
+        """Return the first ``(start, end, word_index)`` found, or None."""
+        return next(self.find_all(text), None)
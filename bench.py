@@ -0,0 +1,256 @@
+"""Benchmarks for the scoring, generation and breach-lookup hot paths.
+
+    python bench.py                          # run everything
+    python bench.py --filter strength        # only matching benchmarks
+    python bench.py --save baseline.json     # record a baseline
+    python bench.py --compare baseline.json  # flag regressions (exit 1)
+    python bench.py --startup                # cold import-to-first-score time
+
+Every benchmark runs one function over a fixed, seeded corpus. Throughput
+(ops/sec) is the best of ``--repeat`` untimed-per-call passes; p50/p99 come
+from timing each call individually in one more pass, and peak memory from a
+final pass under ``tracemalloc``. A benchmark regresses when its throughput
+falls more than ``--threshold`` below the baseline, or its p99 latency or
+peak memory rise by more than that.
+
+``--startup`` instead starts fresh interpreters that import ``strength`` and
+score one ASCII and one non-ASCII password, and fails when the median time
+from import to first score exceeds ``--startup-budget-ms`` or when the
+scoring path pulled in Streamlit.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import strength
+from breach import BloomFilter, HashedSet
+from entropy import estimate_guesses
+from generator import generate_password, generate_passwords
+from passphrase import generate_passphrase
+from strength import (
+    COMMON_PASSWORDS,
+    check_minimum_standards,
+    check_password_strength,
+    check_password_strength_many,
+    is_common_password,
+)
+
+CORPUS_SIZE = 2000
+STARTUP_BUDGET_MS = 25.0
+
+STARTUP_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import strength
+strength.check_password_strength('Startup-Check-1')
+strength.check_password_strength('Пароль-Ёж2024!')
+print(time.perf_counter() - start, 'streamlit' in sys.modules)
+"""
+UNICODE_ALPHABET = 'ÉéßüçñøЖжЁёПпароль日本語한국어٣४€—«»' + '😀🔒𝔸'
+
+
+def build_corpora(size=CORPUS_SIZE, seed=2026):
+    """Named lists of passwords, identical on every run."""
+    rng = random.Random(seed)
+    ascii_chars = string.ascii_letters + string.digits + string.punctuation
+
+    def sample(alphabet, low, high):
+        return [''.join(rng.choice(alphabet) for _ in range(rng.randint(low, high)))
+                for _ in range(size)]
+
+    common = [rng.choice((w, w.upper(), w.capitalize(), w + '!', 'x' + w + '2024'))
+              for w in rng.choices(COMMON_PASSWORDS, k=size)]
+    adversarial = []
+    for i in range(size):
+        kind = i % 5
+        if kind == 0:
+            # Near-misses keep the automaton deep without ever matching
+            adversarial.append('passwor' * rng.randint(4, 16))
+        elif kind == 1:
+            adversarial.append(rng.choice('a1!Z') * rng.randint(64, 256))
+        elif kind == 2:
+            # Full-width variants only match after NFKC normalization
+            word = rng.choice(COMMON_PASSWORDS)
+            adversarial.append(''.join(chr(ord(c) + 0xFEE0) if c.isalnum() else c for c in word))
+        elif kind == 3:
+            adversarial.append(''.join(rng.choice('😀🔒𝔸𝟙') for _ in range(rng.randint(8, 40))))
+        else:
+            adversarial.append('12345678' * rng.randint(2, 8) + 'monkey')
+    return {
+        'short_ascii': sample(ascii_chars, 4, 8),
+        'long_ascii': sample(ascii_chars, 32, 64),
+        'unicode': sample(ascii_chars + UNICODE_ALPHABET * 3, 8, 20),
+        'common': common,
+        'unique': generate_passwords(size, 16),
+        'adversarial': adversarial,
+    }
+
+
+def _breach_sets(seed=7, count=100_000):
+    rng = random.Random(seed)
+    words = [''.join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(rng.randint(6, 12)))
+             for _ in range(count)]
+    hashed = HashedSet(count)
+    bloom = BloomFilter(count, error_rate=0.001)
+    for word in words:
+        hashed.add(word)
+        bloom.add(word)
+    return words, hashed, bloom
+
+
+def build_benchmarks(corpora):
+    """``(name, function, inputs)`` triples; the function takes one input."""
+    benchmarks = []
+    for corpus, passwords in corpora.items():
+        benchmarks.append((f'strength/{corpus}', check_password_strength, passwords))
+        benchmarks.append((f'standards/{corpus}', check_minimum_standards, passwords))
+        benchmarks.append((f'common/{corpus}', is_common_password, passwords))
+    for corpus in ('short_ascii', 'long_ascii', 'unicode'):
+        passwords = corpora[corpus]
+        batches = [passwords[i:i + 100] for i in range(0, len(passwords), 100)]
+        benchmarks.append((f'strength_many_x100/{corpus}', check_password_strength_many, batches))
+        benchmarks.append((f'entropy/{corpus}', estimate_guesses, passwords[:500]))
+
+    words, hashed, bloom = _breach_sets()
+    probes = words[:1000] + corpora['unique'][:1000]
+    benchmarks.append(('breach/hashed_set', hashed.__contains__, probes))
+    benchmarks.append(('breach/bloom', bloom.__contains__, probes))
+
+    lengths = [12] * 1000
+    benchmarks.append(('generate/password_12', generate_password, lengths))
+    benchmarks.append(('generate/batch_x1000', lambda n: generate_passwords(n, 12), [1000] * 20))
+    benchmarks.append(('generate/passphrase_6', lambda words: generate_passphrase(words), [6] * 1000))
+    return benchmarks
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_benchmark(function, inputs, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            function(item)
+        best = min(best, time.perf_counter() - start)
+
+    timer = time.perf_counter_ns
+    samples = []
+    append = samples.append
+    for item in inputs:
+        start = timer()
+        function(item)
+        append(timer() - start)
+    samples.sort()
+
+    tracemalloc.start()
+    for item in inputs:
+        function(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'ops_per_sec': len(inputs) / best,
+        'p50_us': _percentile(samples, 0.50) / 1000,
+        'p99_us': _percentile(samples, 0.99) / 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def measure_startup(runs=10):
+    """Median import-to-first-score seconds over ``runs`` fresh interpreters.
+
+    Also returns whether any run imported Streamlit.
+    """
+    times = []
+    streamlit_loaded = False
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', STARTUP_SNIPPET], check=True,
+                                capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        times.append(float(output[0]))
+        streamlit_loaded |= output[1] == 'True'
+    return statistics.median(times), streamlit_loaded
+
+
+def compare(results, baseline, threshold):
+    """Names of benchmarks that regressed against ``baseline``, with reasons."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        reasons = []
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            reasons.append(f"ops/sec {base['ops_per_sec']:,.0f} -> {result['ops_per_sec']:,.0f}")
+        if result['p99_us'] > base['p99_us'] * (1 + threshold):
+            reasons.append(f"p99 {base['p99_us']:.1f}us -> {result['p99_us']:.1f}us")
+        # Small allocations are noise; only flag growth beyond 64 KiB
+        if result['peak_kib'] > max(base['peak_kib'] * (1 + threshold), base['peak_kib'] + 64):
+            reasons.append(f"peak {base['peak_kib']:.0f}KiB -> {result['peak_kib']:.0f}KiB")
+        if reasons:
+            regressions.append((name, reasons))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the password hot paths.")
+    parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5, help="timed passes per benchmark (best is kept)")
+    parser.add_argument('--save', help="write results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15, help="allowed relative slowdown")
+    parser.add_argument('--startup', action='store_true', help="measure cold start instead")
+    parser.add_argument('--startup-budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        median, streamlit_loaded = measure_startup()
+        print(f"import to first score: {median * 1000:.1f} ms (budget {args.startup_budget_ms:.0f} ms)")
+        if streamlit_loaded:
+            print("REGRESSION startup: the scoring path imported streamlit", file=sys.stderr)
+            return 1
+        if median * 1000 > args.startup_budget_ms:
+            print("REGRESSION startup: over budget", file=sys.stderr)
+            return 1
+        return 0
+
+    # The built-in list only, so results do not depend on the environment
+    strength.set_common_index(None)
+    benchmarks = [b for b in build_benchmarks(build_corpora()) if args.filter in b[0]]
+
+    results = {}
+    width = max((len(name) for name, _, _ in benchmarks), default=0)
+    print(f"{'benchmark':<{width}} {'ops/sec':>12} {'p50 us':>9} {'p99 us':>9} {'peak KiB':>9}")
+    for name, function, inputs in benchmarks:
+        result = results[name] = run_benchmark(function, inputs, args.repeat)
+        print(f"{name:<{width}} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>9.2f} "
+              f"{result['p99_us']:>9.2f} {result['peak_kib']:>9.1f}")
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, reasons in regressions:
+            print(f"REGRESSION {name}: {'; '.join(reasons)}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
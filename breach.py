@@ -0,0 +1,322 @@
+"""Membership indexes for large breached/common password lists.
+
+Two index types are provided, both keyed by the SHA-1 digest of the password
+so that plaintext wordlists (rockyou style, one password per line) and
+HIBP-style SHA-1 dumps (``HASH`` or ``HASH:COUNT`` per line) can be loaded
+into the same structure:
+
+* ``HashedSet`` -- exact membership on a 64-bit fingerprint, stored in an
+  open-addressing table backed by a single ``array('Q')`` (8 bytes per slot
+  instead of a Python object per entry).
+* ``BloomFilter`` -- probabilistic membership with a configurable false
+  positive rate, for lists of 100M+ entries where even 8 bytes per entry is
+  too much.
+
+Plaintext entries are lowercased on load, matching the case-insensitive
+common-password check in ``strength``.
+
+For large lists, ``build_index_file`` compiles a wordlist once into an
+on-disk index (sorted fixed-width fingerprints, or a Bloom filter bit array)
+that ``open_index_file`` memory-maps. Every worker process then shares the
+same pages through the OS page cache and starts without parsing anything:
+
+    python breach.py build rockyou.txt rockyou.idx
+"""
+import argparse
+import bisect
+import hashlib
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+_EMPTY = 0
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+
+def password_digest(password):
+    """SHA-1 digest used as the key for every index in this module."""
+    return hashlib.sha1(password.encode('utf-8', 'surrogatepass')).digest()
+
+
+def _fingerprint(digest):
+    # Zero marks an empty slot, so fold it onto 1
+    return int.from_bytes(digest[:8], 'big') or 1
+
+
+class HashedSet:
+    """Exact membership set of 64-bit password fingerprints.
+
+    Lookups are O(1) with linear probing; the table doubles once it is two
+    thirds full.
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1 << max(4, math.ceil(math.log2(capacity * 3 / 2 + 1)))
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, password):
+        return self.contains_digest(password_digest(password))
+
+    def add(self, password):
+        self.add_digest(password_digest(password))
+
+    def contains_digest(self, digest):
+        fp = _fingerprint(digest)
+        slots = self._slots
+        mask = self._mask
+        i = fp & mask
+        while True:
+            value = slots[i]
+            if value == fp:
+                return True
+            if value == _EMPTY:
+                return False
+            i = (i + 1) & mask
+
+    def add_digest(self, digest):
+        if (self._count + 1) * 3 > len(self._slots) * 2:
+            self._grow()
+        if self._insert(self._slots, self._mask, _fingerprint(digest)):
+            self._count += 1
+
+    @staticmethod
+    def _insert(slots, mask, fp):
+        i = fp & mask
+        while True:
+            value = slots[i]
+            if value == fp:
+                return False
+            if value == _EMPTY:
+                slots[i] = fp
+                return True
+            i = (i + 1) & mask
+
+    def _grow(self):
+        old = self._slots
+        size = len(old) * 2
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        for fp in old:
+            if fp != _EMPTY:
+                self._insert(self._slots, self._mask, fp)
+
+    def fingerprints(self):
+        """Iterate over the stored fingerprints in table order."""
+        return (fp for fp in self._slots if fp != _EMPTY)
+
+
+class BloomFilter:
+    """Bloom filter sized for ``capacity`` entries at ``error_rate``.
+
+    Uses double hashing over two independent 64-bit halves of the SHA-1
+    digest, so no extra hash function is evaluated per probe.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = max(64, bits)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    @classmethod
+    def _from_buffer(cls, buffer, num_bits, num_hashes, count):
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom._bits = buffer
+        bloom._count = count
+        return bloom
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, password):
+        return self.contains_digest(password_digest(password))
+
+    def add(self, password):
+        self.add_digest(password_digest(password))
+
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def contains_digest(self, digest):
+        bits = self._bits
+        for pos in self._positions(digest):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add_digest(self, digest):
+        bits = self._bits
+        for pos in self._positions(digest):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+
+def _is_sha1_line(line):
+    return len(line) >= 40 and (len(line) == 40 or line[40] == ':') \
+        and _HEX_DIGITS.issuperset(line[:40])
+
+
+def iter_wordlist_digests(path):
+    """Yield the SHA-1 digest of every entry in a wordlist or hash dump.
+
+    Lines that look like ``<40 hex chars>`` or ``<40 hex chars>:<count>`` are
+    taken as precomputed SHA-1 hashes; any other non-empty line is treated as
+    a plaintext password and lowercased before hashing.
+    """
+    with open(path, encoding='utf-8', errors='surrogateescape') as fh:
+        for line in fh:
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            if _is_sha1_line(line):
+                yield bytes.fromhex(line[:40])
+            else:
+                yield password_digest(line.lower())
+
+
+def count_entries(path):
+    """Count non-empty lines without decoding them."""
+    count = 0
+    with open(path, 'rb') as fh:
+        for line in fh:
+            if line.strip(b'\r\n'):
+                count += 1
+    return count
+
+
+class SortedFingerprints:
+    """Exact membership over a sorted buffer of 64-bit fingerprints.
+
+    ``buffer`` is anything exposing the fingerprints as a sequence of
+    unsigned 64-bit integers, typically a memoryview over an mmap.
+    """
+
+    def __init__(self, buffer):
+        self._fingerprints = buffer
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    def __contains__(self, password):
+        return self.contains_digest(password_digest(password))
+
+    def contains_digest(self, digest):
+        fp = _fingerprint(digest)
+        fingerprints = self._fingerprints
+        i = bisect.bisect_left(fingerprints, fp)
+        return i < len(fingerprints) and fingerprints[i] == fp
+
+
+# On-disk index layout: a fixed 32-byte little-endian header followed by
+# either the sorted fingerprints (KIND_SORTED) or the Bloom bit array
+# (KIND_BLOOM). The header size keeps the payload 8-byte aligned.
+INDEX_MAGIC = b'PGBIDX01'
+KIND_SORTED = 1
+KIND_BLOOM = 2
+_HEADER = struct.Struct('<8sIIQII')
+
+
+def build_index_file(wordlist_path, out_path, error_rate=None):
+    """Compile a wordlist or SHA-1 dump into an index file for ``open_index_file``.
+
+    Without ``error_rate`` the file holds the sorted, deduplicated
+    fingerprints (8 bytes per entry); with it, a Bloom filter. Returns the
+    number of entries written.
+    """
+    index = load_index(wordlist_path, error_rate=error_rate)
+    with open(out_path, 'wb') as fh:
+        if error_rate is None:
+            fingerprints = array('Q', sorted(index.fingerprints()))
+            if sys.byteorder != 'little':
+                fingerprints.byteswap()
+            fh.write(_HEADER.pack(INDEX_MAGIC, KIND_SORTED, 0, len(fingerprints), 0, 0))
+            fingerprints.tofile(fh)
+            return len(fingerprints)
+        fh.write(_HEADER.pack(INDEX_MAGIC, KIND_BLOOM, 0, len(index),
+                              index.num_bits, index.num_hashes))
+        fh.write(index._bits)
+        return len(index)
+
+
+def is_index_file(path):
+    with open(path, 'rb') as fh:
+        return fh.read(len(INDEX_MAGIC)) == INDEX_MAGIC
+
+
+def open_index_file(path):
+    """Memory-map an index built by ``build_index_file``.
+
+    Nothing is read up front beyond the header; pages are faulted in on
+    lookup and shared between all processes mapping the same file.
+    """
+    with open(path, 'rb') as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, kind, _, count, num_bits, num_hashes = _HEADER.unpack_from(mapped)
+    if magic != INDEX_MAGIC:
+        mapped.close()
+        raise ValueError(f"{path} is not a password index file")
+    payload = memoryview(mapped)[_HEADER.size:]
+    if kind == KIND_SORTED:
+        if sys.byteorder != 'little':
+            mapped.close()
+            raise ValueError("sorted index files are little-endian only")
+        return SortedFingerprints(payload[:count * 8].cast('Q'))
+    if kind == KIND_BLOOM:
+        return BloomFilter._from_buffer(payload, num_bits, num_hashes, count)
+    mapped.close()
+    raise ValueError(f"unknown index kind {kind} in {path}")
+
+
+def load_index(path, error_rate=None, capacity=None):
+    """Load a wordlist or SHA-1 dump into a membership index.
+
+    Returns a ``HashedSet`` by default, or a ``BloomFilter`` when
+    ``error_rate`` is given. ``capacity`` defaults to the number of entries
+    in the file (which costs one extra pass over it). Prebuilt index files
+    are memory-mapped instead of parsed.
+    """
+    if is_index_file(path):
+        return open_index_file(path)
+    if capacity is None:
+        capacity = count_entries(path)
+    if error_rate is None:
+        index = HashedSet(capacity)
+    else:
+        index = BloomFilter(capacity, error_rate)
+    for digest in iter_wordlist_digests(path):
+        index.add_digest(digest)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a memory-mappable breached-password index.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="compile a wordlist or SHA-1 dump")
+    build.add_argument('wordlist')
+    build.add_argument('output')
+    build.add_argument('--error-rate', type=float, default=None,
+                       help="build a Bloom filter with this false-positive rate instead of an exact index")
+    args = parser.parse_args(argv)
+
+    count = build_index_file(args.wordlist, args.output, error_rate=args.error_rate)
+    print(f"Wrote {count} entries to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""k-anonymity range lookups against a local HIBP-style breach store.
+
+Passwords are never looked up directly: the SHA-1 hash is split into a
+5-hex-char prefix and a 35-char suffix, the whole range for the prefix is
+fetched (``SUFFIX:COUNT`` lines, the same format as the Pwned Passwords
+range API) and the suffix is searched locally.
+
+Ranges come from either a directory of ``<PREFIX>.txt`` files
+(``RangeStore``) or a small local HTTP server exposing
+``GET /range/<PREFIX>`` (``serve`` / ``HTTPRangeClient``). Both keep the
+most recently used ranges in memory so repeated checks don't hit disk or
+the network.
+
+Build a store from a SHA-1 dump ordered by hash with:
+
+    python breach_range.py build pwned-passwords-sha1-ordered-by-hash.txt store/
+    python breach_range.py serve store/ --port 8787
+"""
+import abc
+import argparse
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+PREFIX_LENGTH = 5
+_HEX_DIGITS = frozenset('0123456789ABCDEF')
+
+
+def split_hash(password):
+    """Return the ``(prefix, suffix)`` of the uppercase SHA-1 hex digest."""
+    digest = hashlib.sha1(password.encode('utf-8', 'surrogatepass')).hexdigest().upper()
+    return digest[:PREFIX_LENGTH], digest[PREFIX_LENGTH:]
+
+
+def find_count(body, suffix):
+    """Return the breach count for ``suffix`` in a range body, or 0."""
+    needle = suffix.encode('ascii') + b':'
+    start = 0
+    while True:
+        i = body.find(needle, start)
+        if i < 0:
+            return 0
+        if i == 0 or body[i - 1] == 0x0A:
+            end = body.find(b'\n', i)
+            return int(body[i + len(needle):end if end >= 0 else len(body)].strip() or 0)
+        start = i + 1
+
+
+def _check_prefix(prefix):
+    prefix = prefix.upper()
+    if len(prefix) != PREFIX_LENGTH or not _HEX_DIGITS.issuperset(prefix):
+        raise ValueError(f"invalid range prefix {prefix!r}")
+    return prefix
+
+
+class _RangeSource(abc.ABC):
+    """Shared LRU caching for range sources; subclasses implement ``_fetch``."""
+
+    def __init__(self, cache_size=1024):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def _fetch(self, prefix):
+        """Return the range body for a validated ``prefix``."""
+
+    def get_range(self, prefix):
+        """Return the raw ``SUFFIX:COUNT`` body for ``prefix``."""
+        prefix = _check_prefix(prefix)
+        with self._lock:
+            body = self._cache.get(prefix)
+            if body is not None:
+                self._cache.move_to_end(prefix)
+                self.hits += 1
+                return body
+            self.misses += 1
+        body = self._fetch(prefix)
+        with self._lock:
+            self._cache[prefix] = body
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return body
+
+    def breach_count(self, password):
+        """Number of times ``password`` appears in the breach store."""
+        prefix, suffix = split_hash(password)
+        return find_count(self.get_range(prefix), suffix)
+
+
+class RangeStore(_RangeSource):
+    """Range files read directly from ``root/<PREFIX>.txt``."""
+
+    def __init__(self, root, cache_size=1024):
+        super().__init__(cache_size)
+        self.root = root
+
+    def _fetch(self, prefix):
+        try:
+            # Unbuffered: readall() sizes its buffer from fstat and reads into
+            # it directly; the cached range is an immutable bytes object
+            with open(os.path.join(self.root, prefix + '.txt'), 'rb', buffering=0) as fh:
+                return fh.read()
+        except FileNotFoundError:
+            return b''
+
+
+class HTTPRangeClient(_RangeSource):
+    """Ranges fetched from a server started with ``serve``."""
+
+    def __init__(self, base_url, cache_size=1024, timeout=5.0):
+        # Imported here: urllib pulls in http and email, which stores don't need
+        import urllib.request
+        super().__init__(cache_size)
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._urlopen = urllib.request.urlopen
+
+    def _fetch(self, prefix):
+        with self._urlopen(f"{self.base_url}/range/{prefix}", timeout=self.timeout) as response:
+            return response.read()
+
+
+def open_range_source(location, cache_size=1024):
+    """Open a store directory or an ``http://`` range server URL."""
+    if location.startswith(('http://', 'https://')):
+        return HTTPRangeClient(location, cache_size)
+    return RangeStore(location, cache_size)
+
+
+def build_range_store(dump_path, out_dir):
+    """Split a SHA-1 dump ordered by hash into per-prefix range files.
+
+    Each dump line is ``HASH`` or ``HASH:COUNT``. The dump is streamed, so it
+    must already be sorted by hash. Returns the number of hashes written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    current_prefix = None
+    out = None
+    written = 0
+    try:
+        with open(dump_path, 'rb') as dump:
+            for line in dump:
+                line = line.strip()
+                if not line:
+                    continue
+                digest, _, count = line.partition(b':')
+                digest = digest.upper()
+                prefix = digest[:PREFIX_LENGTH].decode('ascii')
+                if prefix != current_prefix:
+                    if current_prefix is not None and prefix < current_prefix:
+                        raise ValueError(f"{dump_path} is not sorted by hash")
+                    if out is not None:
+                        out.close()
+                    out = open(os.path.join(out_dir, prefix + '.txt'), 'wb')
+                    current_prefix = prefix
+                out.write(digest[PREFIX_LENGTH:] + b':' + (count or b'1') + b'\n')
+                written += 1
+    finally:
+        if out is not None:
+            out.close()
+    return written
+
+
+def make_handler(store):
+    from http.server import BaseHTTPRequestHandler
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = self.path.strip('/').split('/')
+            if len(parts) != 2 or parts[0] != 'range':
+                self.send_error(404)
+                return
+            try:
+                body = store.get_range(parts[1])
+            except ValueError:
+                self.send_error(400, "Invalid range prefix")
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return RangeHandler
+
+
+def serve(store, host='127.0.0.1', port=8787):
+    """Serve ``store`` over HTTP until interrupted."""
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local k-anonymity breach range store.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="split a SHA-1 dump into range files")
+    build.add_argument('dump')
+    build.add_argument('store')
+    serve_cmd = subparsers.add_parser('serve', help="serve a range store over HTTP")
+    serve_cmd.add_argument('store')
+    serve_cmd.add_argument('--host', default='127.0.0.1')
+    serve_cmd.add_argument('--port', type=int, default=8787)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build_range_store(args.dump, args.store)
+        print(f"Wrote {count} hashes to {args.store}")
+    else:
+        serve(RangeStore(args.store), args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Memoization of strength results for repeated checks of the same password.
+
+Streamlit reruns the whole script on every widget interaction, so the same
+password is scored again and again. Results are cached per worker process
+(shared by all sessions in it) under a keyed BLAKE2b hash of the password,
+so the plaintext is never kept as a cache key. Entries are evicted least
+recently used first once ``maxsize`` is reached, and expire after ``ttl``
+seconds. The cache empties itself when the common-password list or the
+scoring policy changes.
+
+With a ``sharedcache.SharedCache`` behind it, misses are looked up in (and
+results stored to) a tier shared by every process on the host, so worker
+processes warm each other up. ``default_cache`` uses one when
+``PASSWORD_GUARDIAN_SHARED_CACHE`` names its shared-memory segments.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import strength
+
+
+class StrengthCache:
+    """Thread-safe LRU/TTL cache keyed by a keyed hash of the password."""
+
+    def __init__(self, maxsize=4096, ttl=300.0, secret=None, shared=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = shared
+        if shared is not None:
+            # Keys must be the same in every process sharing the tier
+            secret = shared.secret
+        self._secret = secret if secret is not None else os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = strength.common_list_version()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, namespace, password):
+        """Keyed hash identifying ``password`` within ``namespace``."""
+        h = hashlib.blake2b(password.encode('utf-8', 'surrogatepass'),
+                            key=self._secret, digest_size=16, person=namespace[:16].encode())
+        return h.digest()
+
+    def get_or_compute(self, namespace, password, compute):
+        key = self.key(namespace, password)
+        now = time.monotonic()
+        with self._lock:
+            version = strength.common_list_version()
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        shared = self.shared
+        if shared is not None:
+            value = shared.get(key)
+            if value is not None:
+                self._store(key, value, now, version)
+                return value
+        value = compute(password)
+        if self._store(key, value, now, version) and shared is not None:
+            shared.put(key, value, self.ttl)
+        return value
+
+    def _store(self, key, value, now, version):
+        with self._lock:
+            if self._version != version:
+                # The common-password data changed while computing
+                return False
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+        if self.shared is not None:
+            stats['shared_hits'] = self.shared.hits
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _default_shared():
+    name = os.environ.get('PASSWORD_GUARDIAN_SHARED_CACHE')
+    if not name:
+        return None
+    from sharedcache import SharedCache
+    return SharedCache(name)
+
+
+# One cache per worker process, shared by every session in it
+default_cache = StrengthCache(shared=_default_shared())
+
+
+def _strength(password):
+    strength_label, score, feedback = strength.check_password_strength(password)
+    return strength_label, score, tuple(feedback)
+
+
+def cached_check_password_strength(password, cache=None):
+    cache = default_cache if cache is None else cache
+    strength_label, score, feedback = cache.get_or_compute('strength', password, _strength)
+    return strength_label, score, list(feedback)
+
@@ -0,0 +1,127 @@
+"""Single-pass character class scanner.
+
+Replaces the four ``re.search`` calls (``[A-Z]``, ``[a-z]``, ``\\d``,
+``[!@#$%^&*]``) that used to run over every password. Pure-ASCII input is
+translated through a 256-byte lookup table in one C-level pass.
+
+Characters outside ASCII are classified by Unicode general category:
+uppercase and titlecase letters, lowercase letters, decimal digits, and
+punctuation or symbols as special (so ``É``, ``ß``, ``Ж`` and ``٣`` all
+count). The categories of the whole Basic Multilingual Plane are loaded
+once, on first use, into a 64K-character table used with ``str.translate``;
+only characters beyond the BMP go through ``unicodedata`` one by one. The
+table is read from a compressed snapshot in ``data/`` when it matches the
+running Unicode database (regenerate it with ``save_bmp_snapshot()``), and
+computed otherwise.
+"""
+import os
+import unicodedata
+import zlib
+
+SPECIAL_CHARACTERS = "!@#$%^&*"
+
+# Character class bits, in the order they are reported to users
+UPPERCASE, LOWERCASE, DIGIT, SPECIAL = 1, 2, 4, 8
+CHARACTER_CLASSES = (
+    ('uppercase', UPPERCASE),
+    ('lowercase', LOWERCASE),
+    ('digit', DIGIT),
+    ('special', SPECIAL),
+)
+ALL_CLASSES = UPPERCASE | LOWERCASE | DIGIT | SPECIAL
+
+
+def build_ascii_table(special_characters=SPECIAL_CHARACTERS):
+    """Class bit of every byte, counting ``special_characters`` as special."""
+    table = bytearray(256)
+    for c in b'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        table[c] = UPPERCASE
+    for c in b'abcdefghijklmnopqrstuvwxyz':
+        table[c] = LOWERCASE
+    for c in b'0123456789':
+        table[c] = DIGIT
+    for c in special_characters.encode('ascii'):
+        table[c] = SPECIAL
+    return bytes(table)
+
+
+ASCII_TABLE = build_ascii_table()
+
+
+_CATEGORY_CLASSES = {'Lu': UPPERCASE, 'Lt': UPPERCASE, 'Ll': LOWERCASE, 'Nd': DIGIT}
+
+
+def unicode_class(ch):
+    """Class bit of a non-ASCII character, from its general category."""
+    category = unicodedata.category(ch)
+    return _CATEGORY_CLASSES.get(category) or (SPECIAL if category[0] in 'PS' else 0)
+
+
+BMP_SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'bmp_classes.bin')
+
+_bmp_table = None
+
+
+def _build_bmp_table():
+    return '\0' * 128 + ''.join(chr(unicode_class(chr(cp))) for cp in range(128, 0x10000))
+
+
+def _load_bmp_snapshot(path):
+    """The snapshot table, or None if missing or from another Unicode version."""
+    try:
+        with open(path, 'rb') as fh:
+            version, _, compressed = fh.read().partition(b'\n')
+        if version.decode('ascii') != unicodedata.unidata_version:
+            return None
+        table = zlib.decompress(compressed).decode('latin-1')
+    except (OSError, UnicodeDecodeError, zlib.error):
+        return None
+    return table if len(table) == 0x10000 else None
+
+
+def save_bmp_snapshot(path=BMP_SNAPSHOT):
+    """Write the BMP class table for the running Unicode version to ``path``."""
+    with open(path, 'wb') as fh:
+        fh.write(unicodedata.unidata_version.encode('ascii') + b'\n')
+        fh.write(zlib.compress(_build_bmp_table().encode('latin-1'), 9))
+
+
+def _bmp_classes():
+    """``str.translate`` table of class bits for the BMP, ASCII mapped to 0."""
+    global _bmp_table
+    if _bmp_table is None:
+        _bmp_table = _load_bmp_snapshot(BMP_SNAPSHOT) or _build_bmp_table()
+    return _bmp_table
+
+
+def _class_bytes(password, table=ASCII_TABLE):
+    """Map every character of ``password`` to its class bit, as bytes."""
+    if password.isascii():
+        return password.encode('ascii').translate(table)
+    # ASCII characters follow ``table``, the rest the category table
+    ascii_part = password.encode('ascii', 'ignore').translate(table)
+    try:
+        return ascii_part + password.translate(_bmp_classes()).encode('latin-1')
+    except UnicodeEncodeError:
+        # Characters beyond the BMP are left untouched by the translation
+        return ascii_part + bytes(
+            unicode_class(ch) if ord(ch) >= 128 else 0 for ch in password)
+
+
+def classify(password, table=ASCII_TABLE):
+    """Return the bitmask of character classes present in ``password``.
+
+    ``table`` is an ASCII class table from ``build_ascii_table``.
+    """
+    mapped = _class_bytes(password, table)
+    return ((UPPERCASE in mapped)
+            | (LOWERCASE in mapped) << 1
+            | (DIGIT in mapped) << 2
+            | (SPECIAL in mapped) << 3)
+
+
+def class_counts(password, table=ASCII_TABLE):
+    """Return ``(uppercase, lowercase, digit, special)`` character counts."""
+    mapped = _class_bytes(password, table)
+    return (mapped.count(UPPERCASE), mapped.count(LOWERCASE),
+            mapped.count(DIGIT), mapped.count(SPECIAL))
@@ -0,0 +1,78 @@
+"""Micro-batching of concurrent requests.
+
+``Coalescer`` sits in front of a batch function such as
+``strength.check_password_strength_many``: callers submit one item at a time
+and get a future, while the items are collected and evaluated together once
+``max_items`` have arrived or ``max_delay`` seconds have passed since the
+first one of the batch, whichever comes first. The delay bounds the latency
+added to any single request; under load batches fill up before it expires.
+When a batch fails, its items are retried one at a time, so an item
+that makes ``evaluate`` raise fails only its own caller.
+"""
+import asyncio
+
+
+class Coalescer:
+    """Collects submitted items into batches for an async batch function.
+
+    ``evaluate`` is awaited with a list of items and must return a list of
+    results in the same order.
+    """
+
+    def __init__(self, evaluate, max_items=256, max_delay=0.0002):
+        self.evaluate = evaluate
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.batches = 0
+        self.items = 0
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    def submit(self, item):
+        """Queue ``item`` and return a future for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_items:
+            self.flush()
+        elif self._timer is None:
+            if self.max_delay > 0:
+                self._timer = loop.call_later(self.max_delay, self.flush)
+            else:
+                self._timer = loop.call_soon(self.flush)
+        return future
+
+    def flush(self):
+        """Start evaluating everything collected so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        task = asyncio.get_running_loop().create_task(self._complete(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _complete(self, batch):
+        try:
+            results = await self.evaluate([item for item, _ in batch])
+        except Exception as exc:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(exc)
+                return
+            # Evaluate the items one by one so only the failing ones fail
+            await asyncio.gather(*(self._complete([entry]) for entry in batch))
+            return
+        for (_, future), result in zip(batch, results):
+            # A caller may have given up (cancelled) in the meantime
+            if not future.done():
+                future.set_result(result)
+
+    @property
+    def mean_batch_size(self):
+        return self.items / self.batches if self.batches else 0.0
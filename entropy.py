@@ -0,0 +1,472 @@
+"""Guess-count entropy estimator in the style of zxcvbn.
+
+A password is scanned by a set of pattern matchers (dictionary, reversed
+dictionary, l33t, keyboard walk, repeat, sequence and date). Each match is
+given a guess estimate, and a dynamic program picks the cheapest
+decomposition of the whole password into matches and brute-forced runs.
+
+Everything the matchers need (ranked dictionaries compiled into an
+Aho-Corasick automaton, keyboard adjacency) is precomputed once. Only the
+first ``MAX_ANALYZED_LENGTH`` characters go through every matcher; the rest
+is only scanned for sequences and short repeats, which take linear time,
+which keeps the time per call bounded on adversarial input.
+"""
+import functools
+import math
+import re
+from typing import NamedTuple
+
+from automaton import Automaton
+from strength import COMMON_PASSWORDS
+
+MAX_ANALYZED_LENGTH = 64
+# Longest repeated unit looked for past MAX_ANALYZED_LENGTH
+MAX_TAIL_PERIOD = 16
+BRUTEFORCE_CARDINALITY = 10
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+# Each extra piece in a decomposition multiplies the guesses by this factor,
+# a constant stand-in for the growing l! term zxcvbn uses
+MATCH_PENALTY_LOG10 = 1.0
+REFERENCE_YEAR = 2026
+MIN_YEAR_SPACE = 20
+
+# Ranked dictionaries: earlier entries are more likely and cheaper to guess
+_TOP_PASSWORDS = COMMON_PASSWORDS + [
+    '123456', '1234567', '1234567890', 'qwerty', 'abc123', 'football',
+    'iloveyou', 'dragon', 'baseball', 'master', 'shadow', 'superman',
+    'princess', 'trustno1', 'starwars', 'whatever', 'freedom', 'hello',
+    'charlie', 'donald', 'login', 'admin', 'passw0rd', 'qazwsx', 'zaq1zaq1',
+    'michael', 'jessica', 'mustang', 'access', 'batman', 'ninja', 'azerty',
+    'solo', 'loveme', 'flower', 'hottie', 'lovely', 'secret', 'summer',
+    'winter', 'spring', 'autumn', 'pokemon', 'cheese', 'computer', 'internet',
+]
+_ENGLISH_WORDS = [
+    'the', 'love', 'time', 'life', 'world', 'house', 'money', 'music', 'night',
+    'water', 'light', 'heart', 'happy', 'angel', 'blue', 'green', 'black',
+    'white', 'orange', 'purple', 'silver', 'golden', 'summer', 'winter',
+    'apple', 'banana', 'cherry', 'coffee', 'chocolate', 'cookie', 'tiger',
+    'lion', 'eagle', 'wolf', 'bear', 'horse', 'dog', 'cat', 'fish', 'bird',
+    'king', 'queen', 'prince', 'star', 'moon', 'sun', 'sky', 'fire', 'ice',
+    'rock', 'stone', 'river', 'ocean', 'forest', 'mountain', 'dream', 'magic',
+    'power', 'secret', 'family', 'friend', 'school', 'soccer', 'hockey',
+    'jordan', 'thomas', 'robert', 'daniel', 'matthew', 'andrew', 'joshua',
+    'ashley', 'amanda', 'jennifer', 'sarah', 'maria', 'anna', 'david', 'john',
+    'welcome', 'monkey', 'sunshine', 'letmein', 'password', 'admin', 'guest',
+    'test', 'user', 'root', 'company', 'office', 'google', 'apple', 'summer',
+]
+RANKED_DICTIONARIES = {
+    'passwords': _TOP_PASSWORDS,
+    'english': _ENGLISH_WORDS,
+}
+
+L33T_TABLE = {
+    '4': 'a', '@': 'a', '8': 'b', '(': 'c', '{': 'c', '3': 'e', '6': 'g',
+    '9': 'g', '1': 'i', '!': 'i', '|': 'i', '0': 'o', '$': 's', '5': 's',
+    '7': 't', '+': 't', '%': 'x', '2': 'z',
+}
+
+KEYBOARD_ROWS = (
+    ("`1234567890-=", "~!@#$%^&*()_+"),
+    ("qwertyuiop[]\\", "QWERTYUIOP{}|"),
+    ("asdfghjkl;'", 'ASDFGHJKL:"'),
+    ("zxcvbnm,./", "ZXCVBNM<>?"),
+)
+# Neighbour offsets on a slanted keyboard grid, (row, column)
+_KEYBOARD_DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (-1, 1), (1, 0), (1, -1))
+
+_DATE_WITH_SEPARATOR = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+_DIGIT_RUN = re.compile(r"\d{4,8}")
+_REPEAT_GREEDY = re.compile(r"(.+)\1+", re.DOTALL)
+_REPEAT_LAZY = re.compile(r"(.+?)\1+", re.DOTALL)
+_REPEAT_LAZY_ANCHORED = re.compile(r"(.+?)\1+\Z", re.DOTALL)
+# A fixed unit length keeps each scan linear, unlike the patterns above
+_PERIODIC = tuple(re.compile(rf"(.{{{period}}})\1+", re.DOTALL)
+                  for period in range(1, MAX_TAIL_PERIOD + 1))
+
+
+class Match(NamedTuple):
+    pattern: str
+    i: int
+    j: int
+    token: str
+    guesses: float
+
+
+class Estimate(NamedTuple):
+    guesses: float
+    guesses_log10: float
+    entropy_bits: float
+    score: int
+    sequence: tuple
+
+
+# --- precomputation -------------------------------------------------------
+
+def _build_dictionary(dictionaries):
+    """Compile ranked dictionaries into an automaton plus per-word ranks."""
+    ranks = {}
+    for words in dictionaries.values():
+        for rank, word in enumerate(words, 1):
+            word = word.lower()
+            ranks[word] = min(rank, ranks.get(word, rank))
+    automaton = Automaton(ranks)
+    return automaton, [ranks[word] for word in automaton.words]
+
+
+def _build_keyboard():
+    positions = {}
+    shifted = set()
+    for r, (plain, shift) in enumerate(KEYBOARD_ROWS):
+        for c, ch in enumerate(plain):
+            positions[ch] = (r, c)
+        for c, ch in enumerate(shift):
+            positions[ch] = (r, c)
+            shifted.add(ch)
+    by_position = {}
+    for ch, pos in positions.items():
+        by_position.setdefault(pos, set()).add(ch)
+    adjacency = {}
+    for ch, (r, c) in positions.items():
+        neighbours = {}
+        for direction, (dr, dc) in enumerate(_KEYBOARD_DIRECTIONS):
+            for other in by_position.get((r + dr, c + dc), ()):
+                neighbours[other] = direction
+        adjacency[ch] = neighbours
+    average_degree = sum(len(n) for n in adjacency.values()) / len(adjacency) / 2
+    return adjacency, frozenset(shifted), len(by_position), average_degree
+
+
+@functools.lru_cache(maxsize=None)
+def _dictionary():
+    # Built on first use so importing this module stays cheap
+    return _build_dictionary(RANKED_DICTIONARIES)
+
+
+_KEYBOARD_ADJACENCY, _SHIFTED_KEYS, _KEYBOARD_STARTS, _KEYBOARD_DEGREE = _build_keyboard()
+
+
+# --- guess estimates ------------------------------------------------------
+
+def _n_choose_k(n, k):
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+
+def _uppercase_variations(token):
+    if token.islower() or not any(ch.isalpha() for ch in token):
+        return 1
+    if token.isupper() or (token[0].isupper() and token[1:].islower()) \
+            or (token[-1].isupper() and token[:-1].islower()):
+        return 2
+    upper = sum(1 for ch in token if ch.isupper())
+    lower = sum(1 for ch in token if ch.islower())
+    return sum(_n_choose_k(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def _l33t_variations(token, subs):
+    variations = 1
+    for subbed, letter in subs.items():
+        s = token.count(subbed)
+        u = token.lower().count(letter)
+        if u == 0:
+            variations *= 2
+        else:
+            variations *= sum(_n_choose_k(s + u, i) for i in range(1, min(s, u) + 1))
+    return variations
+
+
+def _spatial_guesses(length, turns, shifted):
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += _n_choose_k(i - 1, j - 1) * _KEYBOARD_STARTS * _KEYBOARD_DEGREE ** j
+    if shifted:
+        unshifted = length - shifted
+        if unshifted == 0:
+            guesses *= 2
+        else:
+            guesses *= sum(_n_choose_k(shifted + unshifted, i)
+                           for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+
+def _bruteforce_log10(length):
+    return length * math.log10(BRUTEFORCE_CARDINALITY)
+
+
+# --- matchers -------------------------------------------------------------
+
+def _dictionary_matches(password, lowered):
+    matches = []
+    automaton, ranks = _dictionary()
+    for i, j, index in automaton.find_all(lowered):
+        token = password[i:j + 1]
+        matches.append(Match('dictionary', i, j, token, ranks[index] * _uppercase_variations(token)))
+    return matches
+
+
+def _reverse_dictionary_matches(password, lowered):
+    n = len(password)
+    matches = []
+    for m in _dictionary_matches(password[::-1], lowered[::-1]):
+        i, j = n - 1 - m.j, n - 1 - m.i
+        matches.append(Match('reverse_dictionary', i, j, password[i:j + 1], m.guesses * 2))
+    return matches
+
+
+def _l33t_matches(password, lowered):
+    if not any(ch in L33T_TABLE for ch in lowered):
+        return []
+    unleeted = ''.join(L33T_TABLE.get(ch, ch) for ch in lowered)
+    matches = []
+    for m in _dictionary_matches(password, unleeted):
+        token = password[m.i:m.j + 1]
+        subs = {ch: L33T_TABLE[ch] for ch in token if ch in L33T_TABLE}
+        if subs:
+            matches.append(Match('l33t', m.i, m.j, token, m.guesses * _l33t_variations(token, subs)))
+    return matches
+
+
+def _spatial_matches(password):
+    matches = []
+    adjacency = _KEYBOARD_ADJACENCY
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        j = i
+        turns = 0
+        last_direction = None
+        shifted = password[i] in _SHIFTED_KEYS
+        while j + 1 < n:
+            direction = adjacency.get(password[j], {}).get(password[j + 1])
+            if direction is None:
+                break
+            if direction != last_direction:
+                turns += 1
+                last_direction = direction
+            j += 1
+            shifted += password[j] in _SHIFTED_KEYS
+        if j - i >= 2:
+            matches.append(Match('spatial', i, j, password[i:j + 1],
+                                 _spatial_guesses(j - i + 1, turns, shifted)))
+        i = j if j > i else i + 1
+    return matches
+
+
+def _repeat_matches(password):
+    matches = []
+    n = len(password)
+    pos = 0
+    while pos < n:
+        greedy = _REPEAT_GREEDY.search(password, pos)
+        if greedy is None:
+            break
+        lazy = _REPEAT_LAZY.search(password, pos)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            # e.g. 'aabaab': the greedy match finds the longer 'aab' base
+            match = greedy
+            base = _REPEAT_LAZY_ANCHORED.match(match.group(0)).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        i, j = match.start(), match.end() - 1
+        base_guesses = 10 ** _most_guessable(base).guesses_log10 if len(base) > 1 \
+            else BRUTEFORCE_CARDINALITY
+        matches.append(Match('repeat', i, j, match.group(0),
+                             base_guesses * (len(match.group(0)) // len(base))))
+        pos = j + 1
+    return matches
+
+
+def _periodic_matches(password):
+    """Repeats of units up to ``MAX_TAIL_PERIOD`` long; one regex scan per length."""
+    matches = []
+    base_guesses = {}
+    for period, pattern in enumerate(_PERIODIC, 1):
+        for m in pattern.finditer(password):
+            base = m.group(1)
+            if base not in base_guesses:
+                base_guesses[base] = BRUTEFORCE_CARDINALITY if period == 1 \
+                    else 10 ** _most_guessable(base).guesses_log10
+            matches.append(Match('repeat', m.start(), m.end() - 1, m.group(0),
+                                 base_guesses[base] * (len(m.group(0)) // period)))
+    return matches
+
+
+def _sequence_class(ch):
+    if 'a' <= ch <= 'z':
+        return 'lower'
+    if 'A' <= ch <= 'Z':
+        return 'upper'
+    if '0' <= ch <= '9':
+        return 'digit'
+    return None
+
+
+def _sequence_matches(password):
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        kind = _sequence_class(password[i])
+        delta = ord(password[i + 1]) - ord(password[i])
+        if kind is None or delta == 0 or abs(delta) > 5 or _sequence_class(password[i + 1]) != kind:
+            i += 1
+            continue
+        j = i + 1
+        while j + 1 < n and _sequence_class(password[j + 1]) == kind \
+                and ord(password[j + 1]) - ord(password[j]) == delta:
+            j += 1
+        if j - i >= 2:
+            first = password[i]
+            base = 4 if first in 'aAzZ019' else 10 if kind == 'digit' else 26
+            if delta < 0:
+                base *= 2
+            matches.append(Match('sequence', i, j, password[i:j + 1], base * (j - i + 1)))
+            i = j
+        else:
+            i += 1
+    return matches
+
+
+def _valid_date(a, b, c):
+    """Return the year if some day/month/year ordering of a, b, c is a date."""
+    for year, x, y in ((c, a, b), (a, b, c)):
+        if year < 100:
+            year += 2000 if year <= 50 else 1900
+        if not 1000 <= year <= 2050:
+            continue
+        if (1 <= x <= 12 and 1 <= y <= 31) or (1 <= y <= 12 and 1 <= x <= 31):
+            return year
+    return None
+
+
+def _date_guesses(year, separator):
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365 * (4 if separator else 1)
+
+
+@functools.lru_cache(maxsize=4096)
+def _digit_date_guesses(token):
+    """Guesses for a separator-free digit token like ``19041988``, or None."""
+    for k in (1, 2) if len(token) <= 6 else (2, 4):
+        for l in range(k + 1, len(token)):
+            year = _valid_date(int(token[:k]), int(token[k:l]), int(token[l:]))
+            if year is not None:
+                return _date_guesses(year, False)
+    return None
+
+
+def _date_matches(password):
+    matches = []
+    for m in _DATE_WITH_SEPARATOR.finditer(password):
+        year = _valid_date(int(m.group(1)), int(m.group(3)), int(m.group(4)))
+        if year is not None:
+            matches.append(Match('date', m.start(), m.end() - 1, m.group(0), _date_guesses(year, True)))
+    for m in _DIGIT_RUN.finditer(password):
+        digits = m.group(0)
+        for length in range(4, len(digits) + 1):
+            for start in range(len(digits) - length + 1):
+                token = digits[start:start + length]
+                guesses = _digit_date_guesses(token)
+                if guesses is not None:
+                    i = m.start() + start
+                    matches.append(Match('date', i, i + length - 1, token, guesses))
+    return matches
+
+
+def _all_matches(password):
+    lowered = password.lower()
+    if len(lowered) != len(password):
+        # Some characters (e.g. 'İ') lowercase to more than one character
+        lowered = ''.join(ch if len(ch.lower()) != 1 else ch.lower() for ch in password)
+    return (_dictionary_matches(password, lowered)
+            + _reverse_dictionary_matches(password, lowered)
+            + _l33t_matches(password, lowered)
+            + _spatial_matches(password)
+            + _repeat_matches(password)
+            + _sequence_matches(password)
+            + _date_matches(password))
+
+
+# --- search ---------------------------------------------------------------
+
+def _most_guessable(password, matches=None):
+    """Cheapest decomposition of ``password`` into matches and brute force."""
+    n = len(password)
+    if matches is None:
+        matches = _all_matches(password)
+    by_end = [[] for _ in range(n)]
+    for m in matches:
+        minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if m.i == m.j else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+        by_end[m.j].append((m, math.log10(max(m.guesses, minimum))))
+
+    step = math.log10(BRUTEFORCE_CARDINALITY)
+    inf = float('inf')
+    # match_cost[k]: best log10 guesses for password[:k] ending on a match
+    # brute_cost[k]: the same, ending on a brute-forced run
+    match_cost = [inf] * (n + 1)
+    brute_cost = [inf] * (n + 1)
+    match_back = [None] * (n + 1)
+    brute_back = [None] * (n + 1)
+    match_cost[0] = -MATCH_PENALTY_LOG10
+    for k in range(1, n + 1):
+        # Extend a brute-force run, or start a new one
+        extend = brute_cost[k - 1] + step
+        start = match_cost[k - 1] + step + MATCH_PENALTY_LOG10
+        if extend <= start:
+            brute_cost[k], brute_back[k] = extend, ('extend', None)
+        else:
+            brute_cost[k], brute_back[k] = start, ('start', None)
+        for m, guesses_log10 in by_end[k - 1]:
+            before = min(match_cost[m.i], brute_cost[m.i])
+            cost = before + guesses_log10 + MATCH_PENALTY_LOG10
+            if cost < match_cost[k]:
+                match_cost[k], match_back[k] = cost, m
+
+    sequence = []
+    k = n
+    on_match = match_cost[n] < brute_cost[n]
+    while k > 0:
+        if on_match:
+            m = match_back[k]
+            sequence.append(m)
+            k = m.i
+            on_match = match_cost[k] <= brute_cost[k]
+        else:
+            end = k
+            while brute_back[k][0] == 'extend':
+                k -= 1
+            k -= 1
+            token = password[k:end]
+            sequence.append(Match('bruteforce', k, end - 1, token, BRUTEFORCE_CARDINALITY ** len(token)))
+            on_match = True
+    sequence.reverse()
+
+    guesses_log10 = max(0.0, min(match_cost[n], brute_cost[n]))
+    return Estimate(10 ** guesses_log10 if guesses_log10 < 300 else float('inf'), guesses_log10, guesses_log10 * math.log2(10),
+                    _guesses_to_score(guesses_log10), tuple(sequence))
+
+
+def _guesses_to_score(guesses_log10):
+    return 0 if guesses_log10 < 3 else 1 if guesses_log10 < 6 else \
+        2 if guesses_log10 < 8 else 3 if guesses_log10 < 10 else 4
+
+
+def estimate_guesses(password):
+    """Estimate how many guesses an attacker needs to find ``password``.
+
+    Returns an ``Estimate`` with the guess count, its log10, the equivalent
+    entropy in bits, a zxcvbn-style 0-4 score and the matched sequence.
+    """
+    if not password:
+        return Estimate(1.0, 0.0, 0.0, 0, ())
+    if len(password) <= MAX_ANALYZED_LENGTH:
+        return _most_guessable(password)
+    # Past the analysed prefix only the linear matchers run, so a long
+    # repeat or sequence is still cheap to guess; everything else there is
+    # brute force
+    head = MAX_ANALYZED_LENGTH
+    matches = _all_matches(password[:head])
+    matches += [m for m in _periodic_matches(password) + _sequence_matches(password)
+                if m.j >= head]
+    return _most_guessable(password, matches)
@@ -0,0 +1,298 @@
+"""Persistent history of strength checks.
+
+Each check is stored as (user, timestamp, strength, score, length): the
+password itself is never stored, only how long it was, so the UI can show a
+masked ``'*' * length``. Rows live in SQLite in WAL mode so readers never
+block the writer. ``record`` only appends to an in-memory queue; a
+background thread writes queued rows in batches, one transaction per batch.
+The last few entries of every user are also kept in a ``deque`` ring buffer
+so the UI can show them without touching the database.
+
+Storage is bounded: the writer deletes rows older than ``max_age`` seconds
+and all but the newest ``max_rows`` rows, at most once per
+``prune_interval``. The ring buffers are kept for the ``recent_users`` most
+recently active users.
+
+Aggregates are maintained as rows are written, in the same transaction:
+per-day counts, weak counts and score sums, and a score histogram, each per
+user and for all users together (``user = ''``). Trend and distribution
+queries read these small tables instead of scanning ``checks``. They are
+the long-term record and are not pruned with the rows.
+
+    store = HistoryStore('history.db')
+    store.record('alice', '🔒 Strong', 6, 14)
+    store.recent('alice')                       # newest first
+    store.query(user='alice', since=time.time() - 86400)
+    store.daily_trend('alice', days=30)         # [DailyStats(day, checks, ...)]
+    store.score_distribution()                  # {score: checks}, all users
+"""
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from typing import NamedTuple
+
+from policy import WEAK_LABEL
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    ts REAL NOT NULL,
+    strength TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checks_user_ts ON checks (user, ts);
+CREATE INDEX IF NOT EXISTS checks_ts ON checks (ts);
+CREATE TABLE IF NOT EXISTS daily_stats (
+    user TEXT NOT NULL,
+    day TEXT NOT NULL,
+    checks INTEGER NOT NULL,
+    weak INTEGER NOT NULL,
+    score_sum INTEGER NOT NULL,
+    PRIMARY KEY (user, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_counts (
+    user TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    checks INTEGER NOT NULL,
+    PRIMARY KEY (user, score)
+) WITHOUT ROWID;
+"""
+
+# Key of the aggregate rows covering every user
+ALL_USERS = ''
+
+_UPSERT_DAILY = """
+INSERT INTO daily_stats (user, day, checks, weak, score_sum) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (user, day) DO UPDATE SET
+    checks = checks + excluded.checks,
+    weak = weak + excluded.weak,
+    score_sum = score_sum + excluded.score_sum
+"""
+_UPSERT_SCORES = """
+INSERT INTO score_counts (user, score, checks) VALUES (?, ?, ?)
+ON CONFLICT (user, score) DO UPDATE SET checks = checks + excluded.checks
+"""
+
+
+class HistoryEntry(NamedTuple):
+    user: str
+    timestamp: float
+    strength: str
+    score: int
+    length: int
+
+
+class DailyStats(NamedTuple):
+    day: str
+    checks: int
+    mean_score: float
+    weak_rate: float
+
+
+def _day(timestamp):
+    return time.strftime('%Y-%m-%d', time.gmtime(timestamp))
+
+
+def _update_aggregates(connection, entries):
+    """Fold ``entries`` into the aggregate tables (inside a transaction)."""
+    daily = {}
+    scores = Counter()
+    for entry in entries:
+        day = _day(entry.timestamp)
+        weak = entry.strength == WEAK_LABEL
+        for user in (entry.user, ALL_USERS):
+            stats = daily.get((user, day))
+            if stats is None:
+                stats = daily[(user, day)] = [0, 0, 0]
+            stats[0] += 1
+            stats[1] += weak
+            stats[2] += entry.score
+            scores[(user, entry.score)] += 1
+    connection.executemany(_UPSERT_DAILY, [(*key, *stats) for key, stats in daily.items()])
+    connection.executemany(_UPSERT_SCORES, [(*key, count) for key, count in scores.items()])
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    connection.execute('PRAGMA journal_mode=WAL')
+    # WAL keeps the database consistent on crashes without a sync per commit
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+class HistoryStore:
+    """SQLite-backed check history with a batched background writer."""
+
+    def __init__(self, path, batch_size=256, recent_size=5, max_age=90 * 86400,
+                 max_rows=1_000_000, prune_interval=60.0, recent_users=10_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.recent_size = recent_size
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self.prune_interval = prune_interval
+        self.recent_users = recent_users
+        self.error = None
+        with _connect(path) as connection:
+            connection.executescript(SCHEMA)
+            # Databases written before aggregates existed are folded in once
+            if connection.execute('SELECT 1 FROM checks LIMIT 1').fetchone() and \
+                    not connection.execute('SELECT 1 FROM daily_stats LIMIT 1').fetchone():
+                self._rebuild_aggregates(connection)
+        self._reader = _connect(path)
+        self._reader_lock = threading.Lock()
+        self._recent = {}
+        self._recent_lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name='history-writer', daemon=True)
+        self._writer.start()
+
+    def record(self, user, strength, score, length, timestamp=None):
+        """Queue one check for writing and add it to the user's recent list."""
+        entry = HistoryEntry(user, time.time() if timestamp is None else timestamp,
+                             strength, score, length)
+        with self._recent_lock:
+            recent = self._recent.pop(user, None)
+            if recent is None:
+                recent = deque(maxlen=self.recent_size)
+            # Reinserted so the dict stays ordered by last activity
+            self._recent[user] = recent
+            recent.appendleft(entry)
+            if len(self._recent) > self.recent_users:
+                del self._recent[next(iter(self._recent))]
+        self._queue.put(entry)
+        return entry
+
+    def recent(self, user):
+        """The user's latest entries, newest first."""
+        with self._recent_lock:
+            recent = self._recent.get(user)
+            if recent is not None:
+                return list(recent)
+        # Not seen since start-up: fill the ring buffer from the database
+        entries = self.query(user=user, limit=self.recent_size)
+        with self._recent_lock:
+            recent = self._recent.setdefault(user, deque(entries, maxlen=self.recent_size))
+            if len(self._recent) > self.recent_users:
+                del self._recent[next(iter(self._recent))]
+            return list(recent)
+
+    def query(self, user=None, since=None, until=None, limit=100):
+        """Stored entries, newest first, optionally for one user and time range."""
+        clauses = []
+        params = []
+        if user is not None:
+            clauses.append('user = ?')
+            params.append(user)
+        if since is not None:
+            clauses.append('ts >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('ts < ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        sql = f"SELECT user, ts, strength, score, length FROM checks {where} ORDER BY ts DESC LIMIT ?"
+        with self._reader_lock:
+            rows = self._reader.execute(sql, (*params, limit)).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def _rebuild_aggregates(self, connection):
+        connection.execute('DELETE FROM daily_stats')
+        connection.execute('DELETE FROM score_counts')
+        cursor = connection.execute('SELECT user, ts, strength, score, length FROM checks')
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            _update_aggregates(connection, [HistoryEntry(*row) for row in rows])
+
+    def _read(self, sql, params):
+        with self._reader_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def score_distribution(self, user=ALL_USERS):
+        """``{score: number of checks}`` for ``user`` (default: everyone)."""
+        return dict(self._read('SELECT score, checks FROM score_counts WHERE user = ? ORDER BY score',
+                               (user,)))
+
+    def daily_trend(self, user=ALL_USERS, days=30):
+        """``DailyStats`` for the last ``days`` days with checks, oldest first."""
+        since = _day(time.time() - days * 86400)
+        rows = self._read('SELECT day, checks, weak, score_sum FROM daily_stats '
+                          'WHERE user = ? AND day > ? ORDER BY day', (user, since))
+        return [DailyStats(day, checks, score_sum / checks, weak / checks)
+                for day, checks, weak, score_sum in rows]
+
+    def summary(self, user=ALL_USERS):
+        """``(checks, mean_score, weak_rate)`` over all time."""
+        checks, weak, score_sum = self._read(
+            'SELECT TOTAL(checks), TOTAL(weak), TOTAL(score_sum) FROM daily_stats WHERE user = ?',
+            (user,))[0]
+        if not checks:
+            return 0, 0.0, 0.0
+        return int(checks), score_sum / checks, weak / checks
+
+    def _prune(self, connection, now=None):
+        """Delete rows beyond ``max_age`` and ``max_rows`` (inside a transaction)."""
+        now = time.time() if now is None else now
+        if self.max_age is not None:
+            connection.execute('DELETE FROM checks WHERE ts < ?', (now - self.max_age,))
+        if self.max_rows is not None:
+            connection.execute(
+                'DELETE FROM checks WHERE id <= '
+                '(SELECT id FROM checks ORDER BY id DESC LIMIT 1 OFFSET ?)', (self.max_rows,))
+
+    def _write_loop(self):
+        connection = _connect(self.path)
+        last_prune = 0.0
+        while True:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(
+                            'INSERT INTO checks (user, ts, strength, score, length) VALUES (?, ?, ?, ?, ?)',
+                            batch)
+                        _update_aggregates(connection, batch)
+                        if time.monotonic() - last_prune >= self.prune_interval:
+                            last_prune = time.monotonic()
+                            self._prune(connection)
+                except sqlite3.Error as exc:
+                    self.error = exc
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                connection.close()
+                return
+
+    def flush(self, timeout=None):
+        """Block until everything recorded so far is written."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        with self._reader_lock:
+            self._reader.close()
@@ -0,0 +1,160 @@
+"""Keystroke-by-keystroke strength evaluation for live meters.
+
+``IncrementalEvaluator`` keeps, for every character typed so far, its class
+bit and the embedded-word automaton state after it. Appending a character
+is one table lookup and one automaton step; deleting pops the stacks. The
+running class counts, the number of positions where a common word ends and
+the current length give the same result as ``check_password_strength`` on
+the whole string:
+
+    evaluator = IncrementalEvaluator()
+    evaluator.append('P')
+    evaluator.set('Passw')        # diffs against the current text
+    evaluator.result()            # == check_password_strength('Passw')
+
+A password is an exact common password when a word of the automaton ends at
+the last position and is as long as the whole input; this holds whenever
+the automaton contains every built-in common password. Two cases need the
+whole string: an installed breach index (which hashes it) and non-ASCII
+input, whose NFKC normalization is not per character. Those fall back to
+``strength.common_level``. Any change to the common-password data or the
+default policy rebuilds the state on the next call.
+"""
+import strength
+from charclass import CHARACTER_CLASSES, unicode_class
+from policy import EMBEDDED_COMMON, EXACT_COMMON, NOT_COMMON
+
+
+class IncrementalEvaluator:
+    """Strength of a password that is edited one character at a time."""
+
+    def __init__(self, password='', policy=None):
+        self._explicit_policy = policy
+        self._chars = []
+        self._classes = []
+        self._states = [0]
+        self._accepting = [False]
+        self._counts = [0] * len(CHARACTER_CLASSES)
+        self._word_ends = 0
+        self._non_ascii = 0
+        self._version = None
+        self._sync()
+        self.append(password)
+
+    def _sync(self):
+        """Rebuild everything if the scoring data changed since last time."""
+        version = strength.common_list_version()
+        if version == self._version:
+            return
+        self._version = version
+        self._policy = self._explicit_policy or strength.scoring_policy()
+        self._table = self._policy.ascii_table
+        self._automaton = automaton = strength.common_words()
+        self._accepts = automaton.tables()[3]
+        words = set(automaton.words)
+        self._exact_by_automaton = all(w in words for w in strength.COMMON_PASSWORDS)
+        chars = self._chars
+        self._chars = []
+        self._classes = []
+        self._states = [0]
+        self._accepting = [False]
+        self._counts = [0] * len(CHARACTER_CLASSES)
+        self._word_ends = 0
+        self._non_ascii = 0
+        self._push(chars)
+
+    def _push(self, chars):
+        table = self._table
+        automaton = self._automaton
+        step = automaton.step
+        accepts = self._accepts
+        counts = self._counts
+        for ch in chars:
+            code = ord(ch)
+            if code < 128:
+                bit = table[code]
+                state = step(self._states[-1], ch.lower())
+            else:
+                bit = unicode_class(ch)
+                self._non_ascii += 1
+                # Non-ASCII input is checked on the whole string instead
+                state = 0
+            accepting = bool(accepts[state])
+            self._chars.append(ch)
+            self._classes.append(bit)
+            self._states.append(state)
+            self._accepting.append(accepting)
+            self._word_ends += accepting
+            if bit:
+                counts[bit.bit_length() - 1] += 1
+
+    def append(self, text):
+        """Add ``text`` (one or more characters) at the end."""
+        self._sync()
+        self._push(text)
+
+    def pop(self, count=1):
+        """Remove the last ``count`` characters."""
+        self._sync()
+        counts = self._counts
+        for _ in range(min(count, len(self._chars))):
+            ch = self._chars.pop()
+            bit = self._classes.pop()
+            self._states.pop()
+            self._word_ends -= self._accepting.pop()
+            if ord(ch) >= 128:
+                self._non_ascii -= 1
+            if bit:
+                counts[bit.bit_length() - 1] -= 1
+
+    def set(self, password):
+        """Make the text ``password``, keeping the common prefix."""
+        self._sync()
+        chars = self._chars
+        keep = 0
+        limit = min(len(chars), len(password))
+        while keep < limit and chars[keep] == password[keep]:
+            keep += 1
+        self.pop(len(chars) - keep)
+        self._push(password[keep:])
+
+    @property
+    def password(self):
+        return ''.join(self._chars)
+
+    def __len__(self):
+        return len(self._chars)
+
+    def mask(self):
+        mask = 0
+        for (_, bit), count in zip(CHARACTER_CLASSES, self._counts):
+            if count:
+                mask |= bit
+        return mask
+
+    def class_counts(self):
+        """``(uppercase, lowercase, digit, special)`` character counts."""
+        return tuple(self._counts)
+
+    def common_level(self):
+        self._sync()
+        if self._non_ascii or strength.common_index() is not None or not self._exact_by_automaton:
+            return strength.common_level(self.password)
+        length = len(self._chars)
+        if length and self._accepting[-1]:
+            # matches_at yields the longest word first
+            word = self._automaton.words[next(self._automaton.matches_at(self._states[-1]))]
+            if len(word) == length and strength.is_common_password(word):
+                return EXACT_COMMON
+        return EMBEDDED_COMMON if self._word_ends else NOT_COMMON
+
+    def result(self):
+        """``(strength, score, feedback)`` as ``check_password_strength`` returns."""
+        level = self.common_level()
+        policy = self._policy
+        strength_label, score, codes = policy.result(len(self._chars), self.mask(), level)
+        return strength_label, score, strength.feedback_messages(codes, policy)
+
+    def minimum_standards(self):
+        self._sync()
+        return self._policy.minimum_standards(len(self._chars), self.mask())
@@ -0,0 +1,161 @@
+"""Opt-in instrumentation of the hot paths.
+
+Disabled by default: instrumented functions check the module-level
+``enabled`` flag once per call and take their usual path when it is off.
+Turn it on with ``enable()`` or ``PASSWORD_GUARDIAN_METRICS=1``.
+
+When enabled, per-stage timings go into fixed-bucket histograms and events
+into counters. Cache hit rates and generator rejection counts are not
+recorded on the hot path at all: the cache and ``RandomBytes`` already keep
+those counts and they are read when metrics are rendered. ``render()``
+produces the Prometheus text format; the service exposes it on ``/metrics``
+and ``start_file_writer`` writes it to a file periodically. Worker
+processes ship their measurements back with ``take_delta``/``merge``.
+"""
+import bisect
+import os
+import sys
+import threading
+import time
+
+PREFIX = 'password_guardian'
+
+# Upper bounds in seconds; the hot paths take microseconds
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2, 0.1, 1.0)
+
+enabled = os.environ.get('PASSWORD_GUARDIAN_METRICS', '') not in ('', '0')
+
+_lock = threading.Lock()
+# stage -> [bucket counts..., +Inf count, sum]
+_histograms = {}
+# (name, ((label, value), ...)) -> count
+_counters = {}
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def observe(stage, seconds):
+    """Record that ``stage`` took ``seconds``."""
+    index = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = [0] * (len(BUCKETS) + 1) + [0.0]
+        histogram[index] += 1
+        histogram[-1] += seconds
+
+
+def count(name, amount=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def take_delta():
+    """Return and clear everything recorded so far (for ``merge`` elsewhere)."""
+    with _lock:
+        delta = (dict(_histograms), dict(_counters))
+        _histograms.clear()
+        _counters.clear()
+    return delta
+
+
+def merge(delta):
+    """Add measurements taken in another process."""
+    histograms, counters = delta
+    with _lock:
+        for stage, values in histograms.items():
+            mine = _histograms.get(stage)
+            if mine is None:
+                _histograms[stage] = list(values)
+            else:
+                _histograms[stage] = [a + b for a, b in zip(mine, values)]
+        for key, value in counters.items():
+            _counters[key] = _counters.get(key, 0) + value
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+def _collected_counters():
+    """Counters kept by other modules, read only if they are loaded."""
+    collected = {}
+    cache = sys.modules.get('cache')
+    if cache is not None:
+        stats = cache.default_cache.stats()
+        collected[('cache_requests_total', (('result', 'hit'),))] = stats['hits']
+        collected[('cache_requests_total', (('result', 'miss'),))] = stats['misses']
+        if 'shared_hits' in stats:
+            collected[('cache_shared_hits_total', ())] = stats['shared_hits']
+    generator = sys.modules.get('generator')
+    if generator is not None:
+        collected[('generator_rejected_bytes_total', ())] = generator.system_random.rejected
+    return collected
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {stage: list(values) for stage, values in _histograms.items()}
+        counters = dict(_counters)
+    counters.update(_collected_counters())
+
+    lines = []
+    name = f'{PREFIX}_stage_seconds'
+    lines.append(f'# TYPE {name} histogram')
+    for stage in sorted(histograms):
+        values = histograms[stage]
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS + ('+Inf',), values):
+            cumulative += bucket
+            lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {values[-1]:.9f}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {cumulative}')
+
+    typed = set()
+    for (counter, labels), value in sorted(counters.items()):
+        full = f'{PREFIX}_{counter}'
+        if full not in typed:
+            typed.add(full)
+            lines.append(f'# TYPE {full} counter')
+        lines.append(f'{full}{_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_file(path):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as fh:
+        fh.write(render())
+    os.replace(tmp, path)
+
+
+def start_file_writer(path, interval=15.0):
+    """Rewrite ``path`` with the current metrics every ``interval`` seconds."""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                write_file(path)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=run, name='metrics-writer', daemon=True)
+    thread.start()
+    return thread
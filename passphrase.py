@@ -0,0 +1,111 @@
+"""Diceware-style passphrase generation.
+
+A wordlist is held as one contiguous ``bytes`` buffer plus an ``array('I')``
+of word offsets instead of a list of string objects, and is loaded lazily,
+once per process, the first time it is needed. Any diceware file works
+(``11111<TAB>word`` lines or one word per line); the built-in list lives in
+``data/wordlist.txt``.
+"""
+import math
+import os
+import threading
+from array import array
+from typing import NamedTuple
+
+from generator import system_random
+
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'wordlist.txt')
+
+
+class WordList:
+    """Read-only list of words backed by a single buffer."""
+
+    def __init__(self, words):
+        buffer = bytearray()
+        offsets = array('I', [0])
+        for word in words:
+            buffer += word.encode('utf-8')
+            offsets.append(len(buffer))
+        self._buffer = bytes(buffer)
+        self._offsets = offsets
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as fh:
+            # Diceware lists prefix each word with its dice roll
+            words = (line.split()[-1] for line in fh if line.strip())
+            return cls(dict.fromkeys(words))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        offsets = self._offsets
+        return self._buffer[offsets[index]:offsets[index + 1]].decode('utf-8')
+
+    @property
+    def bits_per_word(self):
+        return math.log2(len(self))
+
+
+_wordlists = {}
+_wordlists_lock = threading.Lock()
+
+
+def get_wordlist(path=None):
+    """Load ``path`` (default: the built-in list) once per process."""
+    path = path or DEFAULT_WORDLIST
+    wordlist = _wordlists.get(path)
+    if wordlist is None:
+        with _wordlists_lock:
+            wordlist = _wordlists.get(path)
+            if wordlist is None:
+                wordlist = _wordlists[path] = WordList.from_file(path)
+    return wordlist
+
+
+class Passphrase(NamedTuple):
+    phrase: str
+    entropy_bits: float
+
+
+def passphrase_entropy(words, wordlist, digit=False):
+    """Entropy in bits of a passphrase generated with these settings.
+
+    Capitalization is applied to every word, so it adds nothing; a digit
+    appended to a random word adds the choice of digit and of word.
+    """
+    bits = words * wordlist.bits_per_word
+    if digit:
+        bits += math.log2(10) + math.log2(words)
+    return bits
+
+
+def generate_passphrases(n, words=6, separator='-', capitalize=False, digit=False,
+                         wordlist=None, random=None):
+    """Generate ``n`` passphrases of ``words`` words each."""
+    if words < 1:
+        raise ValueError("words must be at least 1")
+    if wordlist is None:
+        wordlist = get_wordlist()
+    random = random or system_random
+    entropy_bits = passphrase_entropy(words, wordlist, digit)
+    picks = random.indexes_below(len(wordlist), n * words)
+    if digit:
+        digit_words = random.indexes_below(words, n)
+        digits = random.choices('0123456789', n)
+
+    phrases = []
+    for i in range(n):
+        chosen = [wordlist[k] for k in picks[i * words:(i + 1) * words]]
+        if capitalize:
+            chosen = [w.capitalize() for w in chosen]
+        if digit:
+            chosen[digit_words[i]] += digits[i]
+        phrases.append(Passphrase(separator.join(chosen), entropy_bits))
+    return phrases
+
+
+def generate_passphrase(words=6, separator='-', capitalize=False, digit=False, wordlist=None):
+    """Generate one passphrase; returns a ``Passphrase`` with its entropy."""
+    return generate_passphrases(1, words, separator, capitalize, digit, wordlist)[0]
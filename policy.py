@@ -0,0 +1,241 @@
+"""Configurable scoring policies.
+
+The thresholds used to score passwords (length tiers, the special character
+set, the common-password penalty, the score needed for each strength label
+and the minimum standards) come from a policy definition, e.g. in TOML::
+
+    [length]
+    good = 8
+    excellent = 12
+
+    [classes]
+    special = "!@#$%^&*"
+
+    [common]
+    exact_penalty = 2
+    not_common_bonus = 1
+
+    [strength]
+    moderate = 4
+    strong = 6
+    extremely_strong = 8
+
+    [minimum]
+    length = 8
+    classes = ["uppercase", "lowercase", "digit", "special"]
+
+or the same structure in JSON. Omitted keys keep the values above. A
+definition is compiled once into a ``ScoringPolicy``: an ASCII class table,
+the table of every possible result and the ordered minimum-standard rules,
+so scoring against it does no parsing or branching on the configuration.
+``PolicyFile`` recompiles a policy file when it changes on disk.
+"""
+import os
+import threading
+import time
+
+from charclass import (
+    ALL_CLASSES,
+    CHARACTER_CLASSES,
+    SPECIAL_CHARACTERS,
+    build_ascii_table,
+    classify,
+)
+
+# Feedback codes returned by the batch API
+LENGTH_EXCELLENT = 'length_excellent'
+LENGTH_GOOD = 'length_good'
+LENGTH_SHORT = 'length_short'
+DIVERSITY_EXCELLENT = 'diversity_excellent'
+MISSING_PREFIX = 'missing_'
+COMMON_PASSWORD = 'common_password'
+COMMON_WORD = 'common_word'
+
+# Values of the common flag used to index the result table
+NOT_COMMON, EMBEDDED_COMMON, EXACT_COMMON = 0, 1, 2
+
+STRENGTH_LABELS = (
+    ('extremely_strong', "💪 Extremely Strong"),
+    ('strong', "🔒 Strong"),
+    ('moderate', "🛡 Moderate"),
+)
+WEAK_LABEL = "⚠️ Weak"
+
+DEFAULT_DEFINITION = {
+    'length': {'good': 8, 'excellent': 12},
+    'classes': {'special': SPECIAL_CHARACTERS},
+    'common': {'exact_penalty': 2, 'not_common_bonus': 1},
+    'strength': {'moderate': 4, 'strong': 6, 'extremely_strong': 8},
+    'minimum': {'length': 8, 'classes': [name for name, _ in CHARACTER_CLASSES]},
+}
+
+
+def _merge(definition):
+    if definition is not None and not isinstance(definition, dict):
+        raise ValueError("a policy definition must be a table/object of sections")
+    merged = {section: dict(values) for section, values in DEFAULT_DEFINITION.items()}
+    for section, values in (definition or {}).items():
+        if section not in merged or not isinstance(values, dict):
+            raise ValueError(f"unknown policy section: {section!r}")
+        for key, value in values.items():
+            if key not in merged[section]:
+                raise ValueError(f"unknown policy setting: {section}.{key}")
+            merged[section][key] = value
+    return merged
+
+
+def _minimum_rules(minimum):
+    """Ordered ``(name, rule)`` pairs; each rule takes ``(length, mask)``."""
+    min_length = int(minimum['length'])
+    if isinstance(minimum['classes'], str):
+        raise ValueError("minimum.classes must be a list of class names")
+    rules = [('length', lambda length, mask: length >= min_length)]
+    bits = dict(CHARACTER_CLASSES)
+    for name in minimum['classes']:
+        if name not in bits:
+            raise ValueError(f"unknown character class: {name!r}")
+        bit = bits[name]
+        rules.append((name, lambda length, mask, bit=bit: bool(mask & bit)))
+    return tuple(rules)
+
+
+class ScoringPolicy:
+    """A policy definition compiled into lookup tables."""
+
+    def __init__(self, definition=None):
+        self.definition = d = _merge(definition)
+        self.good_length = int(d['length']['good'])
+        self.excellent_length = int(d['length']['excellent'])
+        if not 0 <= self.good_length <= self.excellent_length:
+            raise ValueError("length thresholds must satisfy 0 <= good <= excellent")
+        self.special_characters = d['classes']['special']
+        if not isinstance(self.special_characters, str) or not self.special_characters.isascii() or any(ch.isalnum() for ch in self.special_characters):
+            raise ValueError("special characters must be ASCII punctuation")
+        self.ascii_table = build_ascii_table(self.special_characters)
+        self.exact_penalty = int(d['common']['exact_penalty'])
+        self.not_common_bonus = int(d['common']['not_common_bonus'])
+        self._labels = tuple((int(d['strength'][key]), label) for key, label in STRENGTH_LABELS)
+        self.messages = {
+            LENGTH_EXCELLENT: f"✅ Password length is excellent ({self.excellent_length}+ characters)",
+            LENGTH_GOOD: f"⚠️ Password length is good but could be longer ({self.good_length}+ recommended)",
+            LENGTH_SHORT: f"❌ Password should be at least {self.good_length} characters long",
+            DIVERSITY_EXCELLENT: "✅ Excellent character diversity (uppercase, lowercase, number, special)",
+            COMMON_PASSWORD: "❌ Password is in common passwords list - very insecure!",
+            COMMON_WORD: "❌ Password contains a common password or dictionary word",
+        }
+        # Every possible (strength, score, codes) outcome, indexed by
+        # length tier * 48 + class mask * 3 + common level
+        self.results = tuple(
+            self._evaluate(tier, mask, common)
+            for tier in range(3)
+            for mask in range(16)
+            for common in (NOT_COMMON, EMBEDDED_COMMON, EXACT_COMMON)
+        )
+        self.minimum_rules = _minimum_rules(d['minimum'])
+        self.minimum_length = int(d['minimum']['length'])
+
+    def strength_label(self, score):
+        for threshold, label in self._labels:
+            if score >= threshold:
+                return label
+        return WEAK_LABEL
+
+    def _evaluate(self, tier, mask, common):
+        """Score one (length tier, class mask, common flag) combination.
+
+        An exact common password costs ``exact_penalty`` points; an embedded
+        common word only forfeits the bonus for not being common.
+        """
+        score = tier
+        codes = [(LENGTH_SHORT, LENGTH_GOOD, LENGTH_EXCELLENT)[tier]]
+
+        score += bin(mask).count('1')
+        if mask == ALL_CLASSES:
+            codes.append(DIVERSITY_EXCELLENT)
+        else:
+            codes.extend(MISSING_PREFIX + name for name, bit in CHARACTER_CLASSES if not mask & bit)
+
+        if common == EXACT_COMMON:
+            score = max(0, score - self.exact_penalty)
+            codes.append(COMMON_PASSWORD)
+        elif common == EMBEDDED_COMMON:
+            codes.append(COMMON_WORD)
+        else:
+            score += self.not_common_bonus
+
+        return self.strength_label(score), score, tuple(codes)
+
+    def length_tier(self, length):
+        return 2 if length >= self.excellent_length else 1 if length >= self.good_length else 0
+
+    def classify(self, password):
+        return classify(password, self.ascii_table)
+
+    def result(self, length, mask, common):
+        """The ``(strength, score, codes)`` entry for these features."""
+        return self.results[self.length_tier(length) * 48 + mask * 3 + common]
+
+    def minimum_standards(self, length, mask):
+        return {name: rule(length, mask) for name, rule in self.minimum_rules}
+
+
+DEFAULT_POLICY = ScoringPolicy()
+
+
+def parse_policy(text, format='json'):
+    """Parse a policy definition from ``text`` (``'json'`` or ``'toml'``)."""
+    if format == 'toml':
+        try:
+            import tomllib
+        except ImportError:
+            raise RuntimeError("TOML policies need Python 3.11+ (tomllib); use JSON instead")
+        return tomllib.loads(text)
+    import json
+    return json.loads(text)
+
+
+def load_policy(path):
+    """Compile the policy file at ``path``; the format follows its extension."""
+    with open(path, encoding='utf-8') as fh:
+        text = fh.read()
+    return ScoringPolicy(parse_policy(text, 'toml' if path.endswith('.toml') else 'json'))
+
+
+class PolicyFile:
+    """A policy file that is recompiled when it changes on disk.
+
+    The file is stat'ed at most once every ``interval`` seconds. If an edited
+    file fails to parse or validate, the last good policy stays in effect
+    and the problem is kept in ``error``.
+    """
+
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self.error = None
+        self._lock = threading.Lock()
+        self._identity = self._stat()
+        self._policy = load_policy(path)
+        self._checked = time.monotonic()
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def current(self):
+        """The compiled policy, reloaded first if the file has changed."""
+        now = time.monotonic()
+        if now - self._checked < self.interval:
+            return self._policy
+        with self._lock:
+            if now - self._checked >= self.interval:
+                self._checked = now
+                try:
+                    identity = self._stat()
+                    if identity != self._identity:
+                        self._identity = identity
+                        self._policy = load_policy(self.path)
+                        self.error = None
+                except (OSError, RuntimeError, TypeError, ValueError) as exc:
+                    self.error = exc
+        return self._policy
@@ -0,0 +1,310 @@
+"""Asynchronous HTTP scoring service for other backends.
+
+    python service.py --port 8788 --workers 4 --wordlist rockyou.pgbidx --words words.txt
+
+Endpoints (JSON in, JSON out):
+
+    POST /score        {"password": "..."}          -> one result
+    POST /score/batch  {"passwords": ["...", ...]}  -> {"results": [...]}
+    GET  /health                                   -> {"status": "ok", ...}
+    GET  /metrics                                  -> Prometheus text (--metrics)
+
+A result is ``{"strength", "score", "feedback", "messages"}`` where
+``feedback`` holds the feedback codes. Passwords are never logged or echoed.
+
+The server is a plain ``asyncio`` stream server speaking HTTP/1.1 with
+keep-alive, bound to localhost by default. Scoring runs in a process pool so
+the event loop only parses requests. Single-password requests go through a
+``Coalescer``: they are sent to a worker in batches of up to ``max_batch``
+passwords, waiting at most ``max_delay`` seconds for a batch to fill, so
+per-call overhead shrinks as load grows. Load is bounded: a
+request is rejected with 503 once ``max_pending`` passwords are queued or
+being scored, and with 413 when its body or batch is too large.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+
+import metrics
+import strength
+from coalescer import Coalescer
+from policy import load_policy
+
+MAX_BODY = 1 << 20
+MAX_HEADER = 16 << 10
+MAX_BATCH_REQUEST = 1000
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+
+def _init_worker(wordlist, error_rate, policy_path, collect_metrics, words=None):
+    if collect_metrics:
+        metrics.enable()
+    if wordlist:
+        strength.load_common_passwords(wordlist, error_rate=error_rate)
+    if words:
+        strength.load_common_words(words)
+    if policy_path:
+        strength.set_scoring_policy(load_policy(policy_path))
+
+
+def score_batch(passwords):
+    """Worker entry point: ``(strength, score, codes)`` per password.
+
+    Returns the results together with the worker's metrics delta, if any.
+    """
+    results = strength.check_password_strength_many(passwords)
+    return results, metrics.take_delta() if metrics.enabled else None
+
+
+def _check_encodable(passwords):
+    # JSON allows escaped lone surrogates, which are not valid Unicode text
+    for password in passwords:
+        try:
+            password.encode('utf-8')
+        except UnicodeEncodeError:
+            raise HTTPError(400, "passwords must be valid Unicode (no lone surrogates)")
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers
+
+
+class ScoringService:
+    """Scores passwords in a process pool behind an HTTP front end."""
+
+    def __init__(self, workers=None, max_batch=256, max_pending=10000,
+                 max_body=MAX_BODY, max_batch_request=MAX_BATCH_REQUEST,
+                 wordlist=None, error_rate=None, policy_path=None, max_delay=0.0002,
+                 words=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.max_body = max_body
+        self.max_batch_request = max_batch_request
+        self._pool_args = (wordlist, error_rate, policy_path, metrics.enabled, words)
+        # Feedback messages are rendered here, under the same policy
+        self.policy = load_policy(policy_path) if policy_path else None
+        self.pending = 0
+        self._pool = None
+        self.coalescer = Coalescer(self._run, max_batch, max_delay)
+
+    async def start(self, host='127.0.0.1', port=8788):
+        # Workers start lazily, after the server accepts connections; forked
+        # ones would inherit the open client and listening sockets
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('forkserver'),
+            initializer=_init_worker, initargs=self._pool_args)
+        return await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER)
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def _reserve(self, count):
+        if self.pending + count > self.max_pending:
+            raise HTTPError(503, "scoring queue is full", (('Retry-After', '1'),))
+        self.pending += count
+
+    async def _run(self, passwords):
+        loop = asyncio.get_running_loop()
+        results, delta = await loop.run_in_executor(self._pool, score_batch, passwords)
+        if delta is not None:
+            metrics.merge(delta)
+        return results
+
+    async def score(self, password):
+        """Score one password as part of a coalesced batch."""
+        self._reserve(1)
+        try:
+            return await self.coalescer.submit(password)
+        finally:
+            self.pending -= 1
+
+    async def score_many(self, passwords):
+        """Score a list of passwords in chunks of ``max_batch``."""
+        self._reserve(len(passwords))
+        try:
+            size = self.max_batch
+            chunks = await asyncio.gather(*(
+                self._run(passwords[i:i + size]) for i in range(0, len(passwords), size)))
+        finally:
+            self.pending -= len(passwords)
+        return [result for chunk in chunks for result in chunk]
+
+    def _result(self, result):
+        label, score, codes = result
+        return {'strength': label, 'score': score, 'feedback': list(codes),
+                'messages': strength.feedback_messages(codes, self.policy)}
+
+    async def _route(self, method, path, body):
+        if path == '/metrics':
+            if method != 'GET':
+                raise HTTPError(405, "use GET")
+            if not metrics.enabled:
+                raise HTTPError(404, "metrics are disabled (start with --metrics)")
+            return metrics.render()
+        if path == '/health':
+            if method != 'GET':
+                raise HTTPError(405, "use GET")
+            return {'status': 'ok', 'pending': self.pending, 'workers': self.workers,
+                    'mean_batch_size': round(self.coalescer.mean_batch_size, 2)}
+        if path not in ('/score', '/score/batch'):
+            raise HTTPError(404, "not found")
+        if method != 'POST':
+            raise HTTPError(405, "use POST")
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, ValueError):
+            raise HTTPError(400, "body must be JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "body must be a JSON object")
+
+        if path == '/score':
+            password = payload.get('password')
+            if not isinstance(password, str):
+                raise HTTPError(400, "'password' must be a string")
+            _check_encodable([password])
+            return self._result(await self.score(password))
+
+        passwords = payload.get('passwords')
+        if not isinstance(passwords, list) or not all(isinstance(p, str) for p in passwords):
+            raise HTTPError(400, "'passwords' must be a list of strings")
+        if len(passwords) > self.max_batch_request:
+            raise HTTPError(413, f"at most {self.max_batch_request} passwords per request")
+        _check_encodable(passwords)
+        return {'results': [self._result(r) for r in await self.score_many(passwords)]}
+
+    async def _read_request(self, reader):
+        """Return ``(method, path, headers, body)`` or None at end of stream."""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "headers too large")
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        body = b''
+        if method == 'POST':
+            if 'content-length' not in headers:
+                raise HTTPError(411, "Content-Length required")
+            try:
+                length = int(headers['content-length'])
+            except ValueError:
+                raise HTTPError(400, "invalid Content-Length")
+            if length > self.max_body:
+                raise HTTPError(413, f"body larger than {self.max_body} bytes")
+            body = await reader.readexactly(length)
+        return method, target.split('?', 1)[0], headers, body
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request = None
+                keep_alive = True
+                extra_headers = ()
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    status, payload = 200, await self._route(method, path, body)
+                except HTTPError as exc:
+                    status, payload = exc.status, {'error': exc.message}
+                    extra_headers = exc.headers
+                    if request is None:
+                        # The rest of a rejected request would be read as the next one
+                        keep_alive = False
+                except Exception as exc:
+                    # Only the type: messages may quote parts of a password
+                    print(f"error while handling {request and request[1]}: {type(exc).__name__}",
+                          file=sys.stderr)
+                    status, payload = 500, {'error': "internal error"}
+                    keep_alive = request is not None
+                if isinstance(payload, str):
+                    data = payload.encode('utf-8')
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                else:
+                    data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                    content_type = "application/json; charset=utf-8"
+                head = [f"HTTP/1.1 {status} {REASONS[status]}",
+                        f"Content-Type: {content_type}",
+                        f"Content-Length: {len(data)}"]
+                head.extend(f"{name}: {value}" for name, value in extra_headers)
+                if not keep_alive:
+                    head.append("Connection: close")
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host='127.0.0.1', port=8788):
+    """Run ``service`` until cancelled."""
+    server = await service.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP password strength service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8788)
+    parser.add_argument('--workers', type=int, default=None, help="scoring processes (default: CPU count)")
+    parser.add_argument('--max-batch', type=int, default=256, help="passwords per worker call")
+    parser.add_argument('--max-delay-us', type=int, default=200,
+                        help="longest wait for a batch to fill, in microseconds")
+    parser.add_argument('--max-pending', type=int, default=10000,
+                        help="passwords queued or in flight before answering 503")
+    parser.add_argument('--wordlist', help="breach wordlist, dump or prebuilt index")
+    parser.add_argument('--error-rate', type=float, default=None)
+    parser.add_argument('--words', help="plaintext wordlist of words to detect inside passwords")
+    parser.add_argument('--policy', help="scoring policy file (.toml or .json)")
+    parser.add_argument('--metrics', action='store_true', help="collect metrics and serve /metrics")
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        metrics.enable()
+    service = ScoringService(args.workers, args.max_batch, args.max_pending,
+                             wordlist=args.wordlist, error_rate=args.error_rate,
+                             policy_path=args.policy, max_delay=args.max_delay_us / 1e6,
+                             words=args.words)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
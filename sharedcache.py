@@ -0,0 +1,237 @@
+"""Cache tier shared by every process on the host.
+
+Streamlit and worker processes each keep their own ``StrengthCache``; with
+a ``SharedCache`` behind it, a result computed in one process is found by
+the others instead of being computed and stored again in each of them:
+
+    shared = SharedCache('password-guardian')
+    cache = StrengthCache(shared=shared)
+
+The tier is a set of ``multiprocessing.shared_memory`` segments (shards),
+each a fixed table of slots. Keys are placed on shards by consistent
+hashing, so processes configured with a different number of shards still
+agree on where most keys live. Within a shard a key maps to a bucket of
+``WAYS`` slots. There are no cross-process locks: every slot carries a
+checksum of its contents, and a slot torn by a concurrent write reads as a
+miss.
+
+Cached results are only valid for the scoring data they were computed with.
+Keys are scoped by ``data_identity()``, a digest of the breach index's
+source file, the embedded-word list and the scoring policy, so rebuilding
+the wordlist (or changing the policy) makes every older entry unreachable
+without touching other processes. An index installed without a source file
+gets an identity private to its process.
+
+Values are stored with ``marshal`` and must be built from tuples, strings,
+numbers and booleans.
+"""
+import bisect
+import hashlib
+import json
+import marshal
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import strength
+
+MAGIC = b'PGSHC001'
+WAYS = 4
+VIRTUAL_NODES = 64
+
+# magic, slots, slot size, secret; padded to _HEADER_SIZE
+_HEADER = struct.Struct('<8sII32s')
+_HEADER_SIZE = 64
+# checksum, key, expiry (wall clock), payload length
+_SLOT = struct.Struct('<8s16sdH')
+
+
+def _point(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """Consistent hashing of 16-byte keys onto named nodes."""
+
+    def __init__(self, nodes, replicas=VIRTUAL_NODES):
+        points = sorted((_point(f'{node}#{i}'.encode()), node) for node in nodes for i in range(replicas))
+        self._points = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node(self, key):
+        # Keys are already uniform hashes, so their leading bytes are the position
+        index = bisect.bisect(self._points, int.from_bytes(key[:8], 'big'))
+        return self._nodes[index % len(self._nodes)]
+
+
+def _untrack(segment):
+    # Before Python 3.13 the resource tracker unlinks every segment a
+    # process opened when that process exits, even one it only attached to
+    try:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    except Exception:
+        pass
+
+
+class SharedSlots:
+    """Slot table in one shared-memory segment, created by the first opener."""
+
+    def __init__(self, name, slots=4096, slot_size=512):
+        try:
+            segment = shared_memory.SharedMemory(name, create=True, size=_HEADER_SIZE + slots * slot_size)
+            created = True
+        except FileExistsError:
+            segment = shared_memory.SharedMemory(name)
+            created = False
+        _untrack(segment)
+        buf = segment.buf
+        if created:
+            _HEADER.pack_into(buf, 0, bytes(8), slots, slot_size, os.urandom(32))
+            # Written last so that other processes never see half a header
+            buf[:8] = MAGIC
+        else:
+            deadline = time.monotonic() + 1.0
+            while bytes(buf[:8]) != MAGIC:
+                if time.monotonic() > deadline:
+                    segment.close()
+                    raise ValueError(f"shared memory {name!r} is not a cache segment")
+                time.sleep(0.001)
+            _, slots, slot_size, _ = _HEADER.unpack_from(buf)
+        self.name = name
+        self.slots = slots
+        self.slot_size = slot_size
+        self.secret = _HEADER.unpack_from(buf)[3]
+        self._segment = segment
+        self._buf = buf
+        self._buckets = max(1, slots // WAYS)
+        self._max_payload = slot_size - _SLOT.size
+
+    def _bucket(self, key):
+        return _HEADER_SIZE + (int.from_bytes(key[8:], 'big') % self._buckets) * WAYS * self.slot_size
+
+    def get(self, key, now):
+        buf = self._buf
+        offset = self._bucket(key)
+        for _ in range(WAYS):
+            if buf[offset + 8:offset + 24] == key:
+                length = _SLOT.unpack_from(buf, offset)[3]
+                if length > self._max_payload:
+                    return None
+                # Copy first, then check the copy: another process may be
+                # rewriting the slot, even with another key
+                record = bytes(buf[offset:offset + _SLOT.size + length])
+                checksum, slot_key, expires, _ = _SLOT.unpack_from(record)
+                if slot_key != key or expires < now or \
+                        hashlib.blake2b(record[8:], digest_size=8).digest() != checksum:
+                    return None
+                return marshal.loads(record[_SLOT.size:])
+            offset += self.slot_size
+        return None
+
+    def put(self, key, value, expires, now):
+        """Store ``value``; False when it does not fit in a slot."""
+        payload = marshal.dumps(value)
+        if len(payload) > self._max_payload:
+            return False
+        buf = self._buf
+        base = self._bucket(key)
+        target = None
+        for way in range(WAYS):
+            offset = base + way * self.slot_size
+            if buf[offset + 8:offset + 24] == key:
+                target = offset
+                break
+            if target is None and _SLOT.unpack_from(buf, offset)[2] < now:
+                target = offset
+        if target is None:
+            target = base + (key[0] % WAYS) * self.slot_size
+        record = _SLOT.pack(bytes(8), key, expires, len(payload))[8:] + payload
+        buf[target:target + 8 + len(record)] = hashlib.blake2b(record, digest_size=8).digest() + record
+        return True
+
+    def close(self):
+        self._buf = None
+        self._segment.close()
+
+    def unlink(self):
+        # unlink() unregisters the segment, so hand it back to the tracker first
+        resource_tracker.register(self._segment._name, 'shared_memory')
+        self._segment.unlink()
+
+
+_identity = (None, None)
+
+
+def _compute_identity():
+    index = strength.common_index()
+    if index is None:
+        source = None
+    else:
+        source = strength.common_index_source()
+        if source is None:
+            source = ('process', os.getpid(), id(index))
+    data = json.dumps([MAGIC.decode(), strength.COMMON_PASSWORDS, source,
+                       sorted(strength.common_words().words),
+                       strength.scoring_policy().definition], sort_keys=True, default=str)
+    return hashlib.blake2b(data.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def data_identity():
+    """Digest of the scoring data in use, equal in processes holding the same data."""
+    global _identity
+    version = strength.common_list_version()
+    if _identity[0] != version:
+        _identity = (version, _compute_identity())
+    return _identity[1]
+
+
+class SharedCache:
+    """Shared-memory cache tier, sharded by consistent hashing of the keys."""
+
+    def __init__(self, name='password-guardian', shards=4, slots=4096, slot_size=512):
+        self.name = name
+        self._shards = {}
+        try:
+            for i in range(shards):
+                shard_name = f'{name}-{i}'
+                self._shards[shard_name] = SharedSlots(shard_name, slots, slot_size)
+        except BaseException:
+            self.close()
+            raise
+        # Every process derives its keys with the first shard's secret
+        self.secret = self._shards[f'{name}-0'].secret
+        self._ring = HashRing(self._shards)
+        self.hits = 0
+        self.misses = 0
+
+    def _locate(self, key):
+        key = hashlib.blake2b(key, digest_size=16, salt=data_identity()).digest()
+        return self._shards[self._ring.node(key)], key
+
+    def get(self, key):
+        """The value stored under ``key`` for the current scoring data, or None."""
+        shard, key = self._locate(key)
+        value = shard.get(key, time.time())
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value, ttl):
+        shard, key = self._locate(key)
+        now = time.time()
+        return shard.put(key, value, now + ttl, now)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        for shard in self._shards.values():
+            shard.close()
+
+    def unlink(self):
+        """Remove the segments from the system once every process is done."""
+        for shard in self._shards.values():
+            shard.unlink()
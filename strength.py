@@ -0,0 +1,266 @@
+"""Headless password scoring engine.
+
+Everything in here is free of Streamlit so it can be imported by the UI,
+batch audits and services alike. Scoring is table driven: a password is
+reduced to (length tier, character-class mask, common flag) and the final
+strength, score and feedback codes are looked up from a table compiled from
+the scoring policy (see policy.py).
+"""
+import os
+import time
+import unicodedata
+
+import metrics
+from automaton import Automaton
+from charclass import DIGIT, LOWERCASE, SPECIAL, UPPERCASE
+from policy import DEFAULT_POLICY, EMBEDDED_COMMON, EXACT_COMMON, MISSING_PREFIX, NOT_COMMON
+
+# Common password list
+COMMON_PASSWORDS = [
+    'password', '12345678', 'qwerty123', 'letmein', 'admin123',
+    'welcome1', 'monkey', 'sunshine', 'password1', '123456789'
+]
+_COMMON_SET = frozenset(COMMON_PASSWORDS)
+
+# Optional large breach index (see breach.py), consulted after the built-in list
+_common_index = None
+# What the index was loaded from, comparable across processes (see set_common_index)
+_common_source = None
+# Bumped whenever the common-password data changes, so caches can drop results
+_common_version = 0
+
+# Words that weaken a password when embedded in it, e.g. 'Password1!xyz'
+MIN_EMBEDDED_WORD_LENGTH = 4
+_common_words = Automaton(w for w in COMMON_PASSWORDS if len(w) >= MIN_EMBEDDED_WORD_LENGTH)
+
+# The policy used when none is passed explicitly, see set_scoring_policy
+_policy = DEFAULT_POLICY
+
+# Outcomes and messages of the built-in policy
+RESULTS = DEFAULT_POLICY.results
+FEEDBACK_MESSAGES = DEFAULT_POLICY.messages
+
+
+def set_common_index(index, source=None):
+    """Install a ``breach`` index to extend the common-password check.
+
+    Pass ``None`` to go back to the built-in ``COMMON_PASSWORDS`` only.
+    ``source`` identifies the data the index was built from, so that other
+    processes holding the same index can share cached results.
+    """
+    global _common_index, _common_source, _common_version
+    _common_index = index
+    _common_source = source
+    _common_version += 1
+
+
+def load_common_passwords(path, error_rate=None):
+    """Load a wordlist or SHA-1 dump from ``path`` and install it."""
+    from breach import load_index
+    index = load_index(path, error_rate=error_rate)
+    # A rebuilt file has a new inode, size or modification time
+    stat = os.stat(path)
+    set_common_index(index, source=(os.path.realpath(path), stat.st_ino, stat.st_size,
+                                    stat.st_mtime_ns, error_rate))
+    return index
+
+
+def set_common_words(words, min_length=MIN_EMBEDDED_WORD_LENGTH):
+    """Replace the words detected when embedded inside a password.
+
+    The words are compiled into an Aho-Corasick automaton, so the check stays
+    a single scan of the password however many words there are.
+    """
+    global _common_words, _common_version
+    _common_words = Automaton(w.lower() for w in words if len(w) >= min_length)
+    _common_version += 1
+
+
+def load_common_words(path, min_length=MIN_EMBEDDED_WORD_LENGTH):
+    """Install the words of a plaintext wordlist (one per line) as embedded words.
+
+    The built-in common passwords stay detected as well.
+    """
+    with open(path, encoding='utf-8', errors='surrogateescape') as fh:
+        words = [lookup_key(line.rstrip('\r\n')) for line in fh]
+    set_common_words(COMMON_PASSWORDS + words, min_length)
+    return _common_words
+
+
+def set_scoring_policy(policy):
+    """Install the default ``ScoringPolicy`` (None restores the built-in one)."""
+    global _policy, _common_version
+    policy = DEFAULT_POLICY if policy is None else policy
+    if policy is not _policy:
+        _policy = policy
+        _common_version += 1
+
+
+def scoring_policy():
+    """The policy used when none is passed explicitly."""
+    return _policy
+
+
+def common_index():
+    """The installed breach index, or None."""
+    return _common_index
+
+
+def common_index_source():
+    """The ``source`` the installed index was registered with, or None."""
+    return _common_source
+
+
+def common_words():
+    """The automaton of words detected when embedded in a password."""
+    return _common_words
+
+
+def common_list_version():
+    """Counter that changes whenever the common-password data or policy is replaced."""
+    return _common_version
+
+
+def _in_common_index(index, password, lowered):
+    # Plaintext lists are lowercased on load, but SHA-1 dumps are not
+    found = lowered in index or (password != lowered and password in index)
+    if metrics.enabled:
+        metrics.count('breach_index_lookups_total', result='hit' if found else 'miss')
+    return found
+
+
+def lookup_key(password):
+    """Lowercased NFKC form of ``password`` used for common-password lookups.
+
+    NFKC folds compatibility variants such as full-width letters or
+    ligatures, so 'ｐａｓｓｗｏｒｄ' is found as 'password'.
+    """
+    if password.isascii():
+        return password.lower()
+    return unicodedata.normalize('NFKC', password).lower()
+
+
+def is_common_password(password):
+    lowered = lookup_key(password)
+    if lowered in _COMMON_SET:
+        return True
+    index = _common_index
+    return index is not None and _in_common_index(index, password, lowered)
+
+
+def contains_common_word(password):
+    """True if a common password or dictionary word occurs inside ``password``."""
+    return _common_words.contains(lookup_key(password))
+
+
+def common_level(password):
+    """Return ``EXACT_COMMON``, ``EMBEDDED_COMMON`` or ``NOT_COMMON``."""
+    if is_common_password(password):
+        return EXACT_COMMON
+    return EMBEDDED_COMMON if contains_common_word(password) else NOT_COMMON
+
+
+def feedback_messages(codes, policy=None):
+    """Render feedback codes into the messages shown in the UI."""
+    messages_for = (_policy if policy is None else policy).messages
+    messages = []
+    missing = []
+    for code in codes:
+        if code.startswith(MISSING_PREFIX):
+            missing.append(code[len(MISSING_PREFIX):])
+            continue
+        if missing:
+            messages.append(f"❌ Missing character types: {', '.join(missing)}")
+            missing = []
+        messages.append(messages_for[code])
+    if missing:
+        messages.append(f"❌ Missing character types: {', '.join(missing)}")
+    return messages
+
+
+_COMMON_LABELS = ('none', 'embedded', 'exact')
+
+
+def check_password_strength(password: str, policy=None) -> tuple:
+    policy = _policy if policy is None else policy
+    if metrics.enabled:
+        return _check_password_strength_timed(password, policy)
+    strength, score, codes = policy.result(
+        len(password), policy.classify(password), common_level(password))
+    return strength, score, feedback_messages(codes, policy)
+
+
+def _check_password_strength_timed(password, policy):
+    clock = time.perf_counter
+    start = clock()
+    mask = policy.classify(password)
+    classified = clock()
+    level = common_level(password)
+    looked_up = clock()
+    strength, score, codes = policy.result(len(password), mask, level)
+    messages = feedback_messages(codes, policy)
+    done = clock()
+    metrics.observe('classify', classified - start)
+    metrics.observe('common_lookup', looked_up - classified)
+    metrics.observe('feedback', done - looked_up)
+    metrics.observe('check_password_strength', done - start)
+    metrics.count('common_checks_total', result=_COMMON_LABELS[level])
+    return strength, score, messages
+
+
+def check_password_strength_many(passwords, policy=None) -> list:
+    """Score an iterable of passwords.
+
+    Returns one ``(strength, score, codes)`` tuple per password, where
+    ``codes`` is a tuple of feedback codes (see ``FEEDBACK_MESSAGES``).
+    The tuples are shared between calls and must not be mutated.
+    """
+    policy = _policy if policy is None else policy
+    if metrics.enabled:
+        start = time.perf_counter()
+        out = _check_password_strength_many(passwords, policy)
+        metrics.observe('check_password_strength_many', time.perf_counter() - start)
+        metrics.count('batch_passwords_total', len(out))
+        return out
+    return _check_password_strength_many(passwords, policy)
+
+
+def _check_password_strength_many(passwords, policy):
+    results = policy.results
+    good, excellent = policy.good_length, policy.excellent_length
+    classify = policy.classify
+    common_set = _COMMON_SET
+    index = _common_index
+    contains_word = _common_words.contains
+    table = policy.ascii_table
+    out = []
+    append = out.append
+    for password in passwords:
+        length = len(password)
+        if password.isascii():
+            # Inlined ASCII fast path of charclass.classify
+            mapped = password.encode('ascii').translate(table)
+            mask = ((UPPERCASE in mapped) | (LOWERCASE in mapped) << 1
+                    | (DIGIT in mapped) << 2 | (SPECIAL in mapped) << 3)
+            lowered = password.lower()
+        else:
+            mask = classify(password)
+            lowered = lookup_key(password)
+        if lowered in common_set or (
+                index is not None and _in_common_index(index, password, lowered)):
+            common = EXACT_COMMON
+        elif contains_word(lowered):
+            common = EMBEDDED_COMMON
+        else:
+            common = NOT_COMMON
+        append(results[
+            (96 if length >= excellent else 48 if length >= good else 0)
+            + mask * 3
+            + common
+        ])
+    return out
+
+
+def check_minimum_standards(password, policy=None):
+    policy = _policy if policy is None else policy
+    return policy.minimum_standards(len(password), policy.classify(password))
@@ -0,0 +1,36 @@
+import os
+import random
+import string
+import sys
+
+import pytest
+
+# The modules live at the repository root, next to app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import strength  # noqa: E402
+
+ASCII_ALPHABET = string.ascii_letters + string.digits + '!@#$%^&*()-_ '
+ALPHABET = ASCII_ALPHABET + 'É٣ßЖ'
+
+
+def random_passwords(seed, count, max_length=20, alphabet=ALPHABET):
+    """Random passwords plus every built-in common password, mixed into words."""
+    rng = random.Random(seed)
+    passwords = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+                 for _ in range(count)]
+    for word in strength.COMMON_PASSWORDS:
+        passwords += [word, word.upper(), f"xx{word}Z9!", word[:-1]]
+    return passwords
+
+
+@pytest.fixture
+def restore_strength():
+    """Put back the common-password data and policy a test replaces."""
+    saved = (strength.common_index(), strength.common_index_source(),
+             strength.common_words(), strength.scoring_policy())
+    yield
+    index, source, words, policy = saved
+    strength.set_common_index(index, source)
+    strength.set_common_words(words.words, min_length=0)
+    strength.set_scoring_policy(policy)
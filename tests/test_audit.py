@@ -0,0 +1,57 @@
+import io
+import json
+
+import pytest
+
+import audit
+import strength
+from conftest import random_passwords
+
+
+def audit_jsonl(data, **kwargs):
+    out = io.StringIO()
+    histogram = audit.run_audit(io.BytesIO(data), out, 'jsonl', workers=2, **kwargs)
+    return [json.loads(line) for line in out.getvalue().splitlines()], histogram
+
+
+@pytest.fixture
+def passwords():
+    return [p for p in random_passwords(8, 3000) if p and '\n' not in p]
+
+
+def test_records_point_at_their_lines(passwords):
+    data = '\n'.join(passwords).encode() + b'\n'
+    records, histogram = audit_jsonl(data, chunk_size=4096)
+    assert len(records) == len(passwords) == sum(histogram.values())
+    for record, password in zip(records, passwords):
+        start = record['offset']
+        assert data[start:data.index(b'\n', start)].decode() == password
+        assert (record['strength'], record['score']) == strength.check_password_strength(password)[:2]
+
+
+def test_resume_from_checkpoint(passwords, tmp_path):
+    data = '\n'.join(passwords).encode() + b'\n'
+    complete, _ = audit_jsonl(data, chunk_size=4096)
+    checkpoint = tmp_path / 'checkpoint'
+    # Stop after the first few blocks, as if the run had been interrupted
+    head = data[:data.index(b'\n', len(data) // 3) + 1]
+    first, _ = audit_jsonl(head, chunk_size=4096, checkpoint=str(checkpoint))
+    offset = int(checkpoint.read_text())
+    assert offset == len(head)
+    rest, _ = audit_jsonl(data, chunk_size=4096, offset=offset)
+    assert first + rest == complete
+
+
+def test_blank_lines_are_skipped():
+    records, histogram = audit_jsonl(b'\nabc\r\n\n\nPassword1!\n\n', chunk_size=4)
+    assert [(r['offset'], r['length']) for r in records] == [(1, 3), (8, 10)]
+    assert sum(histogram.values()) == 2
+
+
+def test_csv_header_only_on_fresh_runs():
+    out = io.StringIO()
+    audit.run_audit(io.BytesIO(b'a\nb\n'), out, 'csv', workers=1)
+    assert out.getvalue().splitlines()[0] == ','.join(audit.CSV_FIELDS)
+    out = io.StringIO()
+    audit.run_audit(io.BytesIO(b'a\nb\n'), out, 'csv', workers=1, offset=2)
+    assert out.getvalue().splitlines() == ['2,1,2,⚠️ Weak,length_short missing_uppercase missing_digit missing_special']
@@ -0,0 +1,38 @@
+import random
+
+from automaton import Automaton
+
+
+def naive_find_all(words, text):
+    return sorted((i, i + len(w) - 1, index) for index, w in enumerate(words)
+                  for i in range(len(text) - len(w) + 1) if text.startswith(w, i))
+
+
+def test_find_all_matches_naive_search():
+    rng = random.Random(4)
+    alphabet = 'abcdé'
+    words = list(dict.fromkeys(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 6)))
+                               for _ in range(300)))
+    automaton = Automaton(words)
+    for _ in range(500):
+        text = ''.join(rng.choice(alphabet + 'xyz') for _ in range(rng.randint(0, 40)))
+        found = sorted(automaton.find_all(text))
+        assert found == naive_find_all(automaton.words, text)
+        assert automaton.contains(text) == bool(found)
+
+
+def test_step_agrees_with_find_all():
+    automaton = Automaton(['he', 'she', 'his', 'hers'])
+    state = automaton.start()
+    ends = []
+    for end, ch in enumerate('ushers'):
+        state = automaton.step(state, ch)
+        ends += [(end, automaton.words[i]) for i in automaton.matches_at(state)]
+    assert ends == [(3, 'she'), (3, 'he'), (5, 'hers')]
+
+
+def test_empty_wordlist():
+    automaton = Automaton([])
+    assert len(automaton) == 0
+    assert not automaton.contains('anything')
+    assert automaton.search('anything') is None
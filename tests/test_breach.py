@@ -0,0 +1,79 @@
+import hashlib
+
+import pytest
+
+import strength
+from breach import BloomFilter, HashedSet, build_index_file, load_index, open_index_file
+from breach_range import RangeStore, build_range_store, split_hash
+
+WORDS = [f"leaked{i}" for i in range(2000)] + ['Hunter2', 'correct horse', 'ÉCLAIR']
+ABSENT = [f"fresh{i}" for i in range(2000)]
+
+
+@pytest.fixture
+def wordlist(tmp_path):
+    path = tmp_path / 'words.txt'
+    # A SHA-1 dump line is taken as a hash, not as a password
+    dump_line = hashlib.sha1(b'dumped').hexdigest().upper() + ':42'
+    path.write_text('\n'.join(WORDS + ['', dump_line]) + '\n', encoding='utf-8')
+    return path
+
+
+def test_hashed_set_grows():
+    index = HashedSet(4)
+    for word in WORDS:
+        index.add(word)
+    assert all(word in index for word in WORDS)
+    assert not any(word in index for word in ABSENT)
+
+
+def test_sorted_index_file_round_trip(wordlist, tmp_path):
+    path = tmp_path / 'words.idx'
+    assert build_index_file(str(wordlist), str(path)) == len(WORDS) + 1
+    index = open_index_file(str(path))
+    assert len(index) == len(WORDS) + 1
+    # Plaintext entries are lowercased on load
+    assert all(word.lower() in index for word in WORDS)
+    assert 'dumped' in index
+    assert not any(word in index for word in ABSENT)
+    assert isinstance(load_index(str(path)), type(index))
+
+
+def test_bloom_index_file_round_trip(wordlist, tmp_path):
+    path = tmp_path / 'words.bloom'
+    build_index_file(str(wordlist), str(path), error_rate=0.001)
+    index = open_index_file(str(path))
+    assert isinstance(index, BloomFilter)
+    assert all(word.lower() in index for word in WORDS)
+    assert sum(word in index for word in ABSENT) < 20
+
+
+def test_not_an_index_file(wordlist):
+    with pytest.raises(ValueError):
+        open_index_file(str(wordlist))
+
+
+def test_common_check_uses_installed_index(wordlist, restore_strength):
+    assert not strength.is_common_password('Hunter2')
+    strength.load_common_passwords(str(wordlist))
+    assert strength.is_common_password('Hunter2')
+    assert strength.check_password_strength_many(['HUNTER2'])[0][2][-1] == 'common_password'
+
+
+def test_lone_surrogates_are_hashed():
+    password = 'pass\udc80word'
+    index = HashedSet()
+    index.add(password)
+    assert password in index
+    assert split_hash(password)[0] == hashlib.sha1(b'pass\xed\xb2\x80word').hexdigest().upper()[:5]
+
+
+def test_range_store_counts(tmp_path):
+    passwords = {'hunter2': 7, 'letmein': 3}
+    lines = sorted(hashlib.sha1(p.encode()).hexdigest().upper() + f":{n}" for p, n in passwords.items())
+    dump = tmp_path / 'dump.txt'
+    dump.write_text('\n'.join(lines) + '\n')
+    assert build_range_store(str(dump), str(tmp_path / 'store')) == 2
+    store = RangeStore(str(tmp_path / 'store'))
+    assert {p: store.breach_count(p) for p in passwords} == passwords
+    assert store.breach_count('not breached') == 0
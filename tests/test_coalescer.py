@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from coalescer import Coalescer
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_items_are_batched_in_order():
+    batches = []
+
+    async def evaluate(items):
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    async def main():
+        coalescer = Coalescer(evaluate, max_items=4)
+        results = await asyncio.gather(*(coalescer.submit(i) for i in range(10)))
+        return coalescer, results
+
+    coalescer, results = run(main())
+    assert results == [i * 2 for i in range(10)]
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert coalescer.mean_batch_size == pytest.approx(10 / 3)
+
+
+def test_failing_item_fails_only_its_caller():
+    async def evaluate(items):
+        if 'bad' in items:
+            raise ValueError('bad item')
+        return [item.upper() for item in items]
+
+    async def main():
+        coalescer = Coalescer(evaluate, max_items=8)
+        return await asyncio.gather(*(coalescer.submit(item) for item in ['a', 'bad', 'c']),
+                                    return_exceptions=True)
+
+    first, failed, last = run(main())
+    assert (first, last) == ('A', 'C')
+    assert isinstance(failed, ValueError)
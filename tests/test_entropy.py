@@ -0,0 +1,36 @@
+import pytest
+
+from entropy import MAX_ANALYZED_LENGTH, estimate_guesses
+
+
+def test_empty_password():
+    assert estimate_guesses('').score == 0
+
+
+@pytest.mark.parametrize('password', ['password', 'P@ssw0rd', 'qwertyuiop', 'abcdefgh', 'aaaaaaaaaaaa',
+                                      '19041988', 'monkey123'])
+def test_patterns_are_weak(password):
+    assert estimate_guesses(password).score <= 1
+
+
+def test_random_password_is_strong():
+    assert estimate_guesses('kT9#vq2!Lm_x4Rz').score == 4
+
+
+def test_sequence_covers_password():
+    estimate = estimate_guesses('correcthorsebatterystaple')
+    assert ''.join(match.token for match in estimate.sequence) == 'correcthorsebatterystaple'
+
+
+@pytest.mark.parametrize('password', ['x' * 200, 'abc' * 80, '0123456789' * 10, 'Ab1!' * 50])
+def test_patterns_past_analysed_prefix_stay_weak(password):
+    assert len(password) > MAX_ANALYZED_LENGTH
+    estimate = estimate_guesses(password)
+    assert estimate.score <= 2
+    assert ''.join(match.token for match in estimate.sequence) == password
+
+
+def test_random_tail_is_still_counted():
+    head = 'x' * MAX_ANALYZED_LENGTH
+    assert estimate_guesses(head + 'kT9#vq2!Lm_x4Rz').guesses_log10 > \
+        estimate_guesses(head).guesses_log10 + 10
@@ -0,0 +1,84 @@
+import random
+import sqlite3
+import time
+
+import pytest
+
+from history import ALL_USERS, HistoryStore
+from policy import STRENGTH_LABELS, WEAK_LABEL
+
+LABELS = [WEAK_LABEL] + [label for _, label in STRENGTH_LABELS]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'), batch_size=50)
+    yield store
+    store.close()
+
+
+def record_random(store, count, seed=9):
+    rng = random.Random(seed)
+    now = time.time()
+    for _ in range(count):
+        store.record(rng.choice(['alice', 'bob', 'carol']), rng.choice(LABELS), rng.randint(0, 7),
+                     rng.randint(1, 30), timestamp=now - rng.uniform(0, 20 * 86400))
+    assert store.flush(10)
+    assert store.error is None
+
+
+def group_by(store, user):
+    where, params = ('', ()) if user == ALL_USERS else ('WHERE user = ?', (user,))
+    with sqlite3.connect(store.path) as connection:
+        distribution = dict(connection.execute(
+            f"SELECT score, COUNT(*) FROM checks {where} GROUP BY score ORDER BY score", params))
+        checks, weak, score_sum = connection.execute(
+            f"SELECT COUNT(*), SUM(strength = ?), SUM(score) FROM checks {where}",
+            (WEAK_LABEL, *params)).fetchone()
+        days = connection.execute(
+            f"SELECT date(ts, 'unixepoch') AS day, COUNT(*) FROM checks {where} "
+            f"GROUP BY day ORDER BY day", params).fetchall()
+    return distribution, (checks, score_sum / checks, weak / checks), days
+
+
+@pytest.mark.parametrize('user', [ALL_USERS, 'alice', 'bob'])
+def test_aggregates_match_group_by(store, user):
+    record_random(store, 1000)
+    distribution, summary, days = group_by(store, user)
+    assert store.score_distribution(user) == distribution
+    assert store.summary(user) == pytest.approx(summary)
+    assert [(day.day, day.checks) for day in store.daily_trend(user, days=30)] == days
+
+
+def test_recent_is_newest_first_and_bounded(store):
+    for score in range(8):
+        store.record('dave', WEAK_LABEL, score, 8)
+    assert [entry.score for entry in store.recent('dave')] == [7, 6, 5, 4, 3]
+
+
+def test_recent_reloads_from_database(store, tmp_path):
+    record_random(store, 200)
+    reopened = HistoryStore(store.path)
+    try:
+        assert reopened.recent('alice') == store.query(user='alice', limit=5)
+    finally:
+        reopened.close()
+
+
+def test_pruning_keeps_aggregates(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'), max_age=10 * 86400, max_rows=300,
+                         prune_interval=0)
+    try:
+        record_random(store, 1000)
+        summary = store.summary()
+        distribution = store.score_distribution()
+        # The next batch triggers a prune
+        store.record('alice', WEAK_LABEL, 0, 8)
+        assert store.flush(10)
+        rows = store.query(limit=10000)
+        assert 0 < len(rows) <= 300
+        assert min(entry.timestamp for entry in rows) >= time.time() - 10 * 86400 - 60
+        assert store.summary()[0] == summary[0] + 1
+        assert sum(store.score_distribution().values()) == sum(distribution.values()) + 1
+    finally:
+        store.close()
@@ -0,0 +1,40 @@
+import random
+
+import strength
+from conftest import ALPHABET, random_passwords
+from incremental import IncrementalEvaluator
+
+
+def test_set_matches_full_evaluation():
+    evaluator = IncrementalEvaluator()
+    for password in random_passwords(2, 5000):
+        evaluator.set(password)
+        assert evaluator.password == password
+        assert evaluator.result() == strength.check_password_strength(password)
+        assert evaluator.minimum_standards() == strength.check_minimum_standards(password)
+
+
+def test_typing_and_deleting_matches_full_evaluation():
+    rng = random.Random(3)
+    alphabet = ALPHABET + 'passwordmonkey'
+    evaluator = IncrementalEvaluator()
+    text = ''
+    for _ in range(20000):
+        # Mostly typing, kept to password-like lengths
+        if text and (len(text) > 24 or rng.random() < 0.3):
+            count = rng.randint(1, 3)
+            evaluator.pop(count)
+            text = text[:-count]
+        else:
+            ch = rng.choice(alphabet)
+            evaluator.append(ch)
+            text += ch
+        assert evaluator.result() == strength.check_password_strength(text)
+
+
+def test_follows_replaced_words(restore_strength):
+    evaluator = IncrementalEvaluator('xxdragonxx')
+    assert evaluator.common_level() == strength.common_level('xxdragonxx')
+    strength.set_common_words(strength.COMMON_PASSWORDS + ['dragon'])
+    assert evaluator.result() == strength.check_password_strength('xxdragonxx')
+    assert 'common_word' in strength.check_password_strength_many(['xxdragonxx'])[0][2]
@@ -0,0 +1,110 @@
+import re
+
+import pytest
+
+import strength
+from conftest import ASCII_ALPHABET, random_passwords
+from policy import DEFAULT_POLICY, ScoringPolicy, parse_policy
+
+BASELINE_COMMON = [
+    'password', '12345678', 'qwerty123', 'letmein', 'admin123',
+    'welcome1', 'monkey', 'sunshine', 'password1', '123456789'
+]
+
+
+def baseline_check(password):
+    """The original app's check_password_strength, before policies existed."""
+    score = 0
+    feedback = []
+    if len(password) >= 12:
+        score += 2
+        feedback.append("✅ Password length is excellent (12+ characters)")
+    elif len(password) >= 8:
+        score += 1
+        feedback.append("⚠️ Password length is good but could be longer (8+ recommended)")
+    else:
+        feedback.append("❌ Password should be at least 8 characters long")
+    checks = {
+        'uppercase': re.search(r"[A-Z]", password),
+        'lowercase': re.search(r"[a-z]", password),
+        'digit': re.search(r"\d", password),
+        'special': re.search(r"[!@#$%^&*]", password)
+    }
+    diversity_score = sum(1 for check in checks.values() if check)
+    score += diversity_score
+    if diversity_score == 4:
+        feedback.append("✅ Excellent character diversity (uppercase, lowercase, number, special)")
+    else:
+        missing = [k for k, v in checks.items() if not v]
+        feedback.append(f"❌ Missing character types: {', '.join(missing)}")
+    if password.lower() in BASELINE_COMMON:
+        score = max(0, score - 2)
+        feedback.append("❌ Password is in common passwords list - very insecure!")
+    else:
+        score += 1
+    return score, feedback
+
+
+def baseline_standards(password):
+    return {
+        'length': len(password) >= 8,
+        'uppercase': bool(re.search(r'[A-Z]', password)),
+        'lowercase': bool(re.search(r'[a-z]', password)),
+        'digit': bool(re.search(r'\d', password)),
+        'special': bool(re.search(r'[!@#$%^&*]', password))
+    }
+
+
+def label(score):
+    return "💪 Extremely Strong" if score >= 8 else \
+        "🔒 Strong" if score >= 6 else \
+        "🛡 Moderate" if score >= 4 else \
+        "⚠️ Weak"
+
+
+def embeds_common_word(password):
+    lowered = password.lower()
+    return lowered not in BASELINE_COMMON and any(
+        word in lowered for word in BASELINE_COMMON if len(word) >= strength.MIN_EMBEDDED_WORD_LENGTH)
+
+
+def baseline_result(password):
+    score, feedback = baseline_check(password)
+    if embeds_common_word(password):
+        # The one deliberate change: an embedded common word forfeits the bonus
+        score -= 1
+        feedback.append("❌ Password contains a common password or dictionary word")
+    return label(score), score, feedback
+
+
+def test_default_policy_matches_baseline():
+    # Non-ASCII letters now count towards the classes, so only digits (which
+    # the old \d already matched in any script) are mixed in
+    passwords = random_passwords(1, 20000, alphabet=ASCII_ALPHABET + '٣')
+    assert [strength.check_password_strength(p) for p in passwords] == \
+        [baseline_result(p) for p in passwords]
+    assert [strength.check_minimum_standards(p) for p in passwords] == \
+        [baseline_standards(p) for p in passwords]
+
+
+def test_non_ascii_letters_count_as_classes():
+    assert strength.check_minimum_standards('Éß٣!') == {
+        'length': False, 'uppercase': True, 'lowercase': True, 'digit': True, 'special': True}
+
+
+def test_empty_definition_is_default():
+    policy = ScoringPolicy(parse_policy('{}'))
+    assert policy.results == DEFAULT_POLICY.results
+    assert policy.minimum_length == 8
+
+
+@pytest.mark.parametrize('text', [
+    '[1]',
+    '{"length": 8}',
+    '{"classes": {"special": 5}}',
+    '{"minimum": {"classes": "digit"}}',
+    '{"minimum": {"length": "eight"}}',
+])
+def test_malformed_policy_rejected(text):
+    with pytest.raises(ValueError):
+        ScoringPolicy(parse_policy(text))
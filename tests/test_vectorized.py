@@ -0,0 +1,36 @@
+import pytest
+
+import strength
+from conftest import random_passwords
+
+np = pytest.importorskip('numpy')
+vectorized = pytest.importorskip('vectorized')
+
+
+def expected(passwords):
+    return [strength.check_password_strength(p)[:2] for p in passwords]
+
+
+def test_unicode_array_matches_scalar():
+    passwords = random_passwords(5, 20000) + ['', 'ｐａｓｓｗｏｒｄ', 'xxMONKEYxx', '😀Aa1!😀']
+    strengths, scores = vectorized.check_password_strength_array(passwords)
+    assert list(zip(strengths.tolist(), scores.tolist())) == expected(passwords)
+
+
+def test_bytes_array_matches_scalar():
+    passwords = [p for p in random_passwords(6, 20000) if '\x00' not in p]
+    column = np.array([p.encode() for p in passwords], dtype='S')
+    strengths, scores = vectorized.check_password_strength_array(column)
+    assert list(zip(strengths.tolist(), scores.tolist())) == expected(passwords)
+
+
+def test_custom_words_match_scalar(restore_strength):
+    strength.set_common_words(strength.COMMON_PASSWORDS + ['dragon', 'soccer', 'Éclair'])
+    passwords = random_passwords(7, 5000) + ['xxdragonxx', 'SOCCER12', 'éclair!', 'ÉCLAIRS']
+    strengths, scores = vectorized.check_password_strength_array(passwords)
+    assert list(zip(strengths.tolist(), scores.tolist())) == expected(passwords)
+
+
+def test_empty_input():
+    strengths, scores = vectorized.check_password_strength_array([])
+    assert len(strengths) == len(scores) == 0
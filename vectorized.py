@@ -0,0 +1,167 @@
+"""Vectorized scoring of password columns with NumPy.
+
+For offline audits passwords are often held as fixed-width NumPy arrays
+(``S`` or ``U`` dtype, e.g. straight from Arrow or a ``.npy`` dump). This
+module applies the ``strength.check_password_strength`` rules to a whole
+column at once and produces the same scores and strengths as the scalar
+function.
+
+Length tiers and character classes are computed on the raw code-unit
+matrix. For ASCII rows the common-password check is vectorized too: rows are
+lowercased in place, exact matches are found with ``np.isin`` and the
+embedded-word automaton is stepped one character column at a time across
+all rows. Rows that need hashing (an installed breach index) or Unicode
+normalization and case folding fall back to the scalar check, once per
+distinct password.
+"""
+import numpy as np
+
+import strength
+from charclass import unicode_class
+from strength import (
+    COMMON_PASSWORDS,
+    EMBEDDED_COMMON,
+    EXACT_COMMON,
+    common_level,
+)
+
+# NumPy versions of each policy's tables: (policy, scores, strengths, classes)
+_tables = (None, None, None, None)
+
+
+def _policy_tables(policy):
+    global _tables
+    if _tables[0] is not policy:
+        results = policy.results
+        _tables = (policy,
+                   np.array([score for _, score, _ in results], dtype=np.int8),
+                   np.array([label for label, _, _ in results]),
+                   np.frombuffer(policy.ascii_table, dtype=np.uint8))
+    return _tables
+
+
+def _as_password_array(passwords):
+    arr = np.asarray(passwords)
+    if arr.dtype.kind == 'S':
+        if arr.size and arr.view(np.uint8).max() >= 0x80:
+            # Multi-byte UTF-8: lengths and classes must be per character
+            arr = np.char.decode(arr, 'utf-8', 'surrogateescape')
+    elif arr.dtype.kind != 'U':
+        arr = arr.astype(str)
+    return arr.reshape(-1)
+
+
+def _code_units(arr):
+    """View ``arr`` as a 2-D matrix of code units (bytes or code points)."""
+    unit = np.uint8 if arr.dtype.kind == 'S' else np.uint32
+    width = arr.dtype.itemsize // np.dtype(unit).itemsize
+    return np.ascontiguousarray(arr).view(unit).reshape(len(arr), width)
+
+
+def _class_masks(units, ascii_classes):
+    classes = np.zeros(units.shape, dtype=np.uint8)
+    ascii_units = units < 0x80
+    classes[ascii_units] = ascii_classes[units[ascii_units]]
+    if not ascii_units.all():
+        # Outside ASCII classes come from the Unicode category, as in charclass
+        wide_units = units[~ascii_units]
+        wide = np.unique(wide_units)
+        wide_classes = np.array([unicode_class(chr(int(cp))) for cp in wide], dtype=np.uint8)
+        classes[~ascii_units] = wide_classes[np.searchsorted(wide, wide_units)]
+    return np.bitwise_or.reduce(classes, axis=1) if units.shape[1] else \
+        np.zeros(len(units), dtype=np.uint8)
+
+
+def _scalar_common_levels(arr):
+    unique, inverse = np.unique(arr, return_inverse=True)
+    decode = arr.dtype.kind == 'S'
+    levels = np.fromiter(
+        (common_level(p.decode('ascii') if decode else p) for p in unique.tolist()),
+        dtype=np.int16, count=len(unique))
+    return levels[inverse.reshape(-1)]
+
+
+def _advance(base, check, fail, state, column):
+    """One automaton step for every row; rows that miss retry from their failure state."""
+    result = np.zeros_like(state)
+    rows = np.flatnonzero(column)
+    current = state[rows]
+    column = column[rows]
+    while len(rows):
+        target = base[current] + column
+        hit = check[target] == current
+        result[rows[hit]] = target[hit]
+        # A miss at the root stays at the root (already zero)
+        retry = ~hit & (current != 0)
+        rows = rows[retry]
+        current = fail[current[retry]]
+        column = column[retry]
+    return result
+
+
+def _ascii_common_levels(units):
+    """Common levels for rows of ASCII code units (uint8 or uint32 matrix)."""
+    lowered = units.astype(np.uint8)
+    lowered += ((lowered >= 0x41) & (lowered <= 0x5A)).view(np.uint8) * 0x20
+    levels = np.zeros(len(lowered), dtype=np.int16)
+
+    width = lowered.shape[1]
+    if width:
+        exact = np.isin(lowered.view(f'S{width}').reshape(-1),
+                        np.array([w.encode() for w in COMMON_PASSWORDS]))
+        levels[exact] = EXACT_COMMON
+
+    base, check, fail, accepts, ascii_columns = strength.common_words().tables()
+    if not width:
+        return levels
+    base = np.frombuffer(base, dtype=np.int32)
+    check = np.frombuffer(check, dtype=np.int32)
+    fail = np.frombuffer(fail, dtype=np.int32)
+    accepting = np.frombuffer(accepts, dtype=np.uint8).astype(bool)
+    columns = np.frombuffer(ascii_columns, dtype=np.uint8).astype(np.int32)
+    state = np.zeros(len(lowered), dtype=np.int32)
+    embedded = np.zeros(len(lowered), dtype=bool)
+    # Trailing NUL padding maps to column 0 and resets to the root
+    for k in range(width):
+        column = columns[lowered[:, k]]
+        state = _advance(base, check, fail, state, column)
+        embedded |= accepting[state]
+    levels[embedded & (levels == 0)] = EMBEDDED_COMMON
+    return levels
+
+
+def _common_levels(arr, units):
+    if strength.common_index() is not None:
+        return _scalar_common_levels(arr)
+    ascii_rows = (units < 0x80).all(axis=1)
+    if ascii_rows.all():
+        return _ascii_common_levels(units)
+    levels = np.empty(len(arr), dtype=np.int16)
+    levels[ascii_rows] = _ascii_common_levels(units[ascii_rows])
+    levels[~ascii_rows] = _scalar_common_levels(arr[~ascii_rows])
+    return levels
+
+
+def score_indexes(passwords, policy=None):
+    """Index of every password's outcome in the policy's ``results``."""
+    policy = strength.scoring_policy() if policy is None else policy
+    arr = _as_password_array(passwords)
+    if not len(arr):
+        return np.zeros(0, dtype=np.int16)
+    lengths = np.char.str_len(arr)
+    tiers = (lengths >= policy.good_length).astype(np.int16) + (lengths >= policy.excellent_length)
+    units = _code_units(arr)
+    masks = _class_masks(units, _policy_tables(policy)[3]).astype(np.int16)
+    return tiers * 48 + masks * 3 + _common_levels(arr, units)
+
+
+def check_password_strength_array(passwords, policy=None):
+    """Score a column of passwords.
+
+    Returns ``(strengths, scores)`` arrays matching what
+    ``check_password_strength`` returns for each element.
+    """
+    policy = strength.scoring_policy() if policy is None else policy
+    indexes = score_indexes(passwords, policy)
+    _, scores, strengths, _ = _policy_tables(policy)
+    return strengths[indexes], scores[indexes]